@@ -7,8 +7,10 @@ rather than through the CLI.
 """
 
 import asyncio
-import json
-from src.swarm import analyze_stock
+import threading
+from src.config import config
+from src.swarm import analyze_stock, analyze_stocks_batch, init_swarm, shutdown_swarm
+from src.utils.json_utils import dumps, dumps_bytes
 
 
 async def example_basic():
@@ -26,27 +28,27 @@ async def example_basic():
 
 
 async def example_multiple_stocks():
-    """Analyze multiple stocks in sequence."""
+    """Analyze multiple stocks concurrently."""
     print("\n" + "=" * 80)
     print("Example 2: Multiple Stock Analysis")
     print("=" * 80 + "\n")
 
     tickers = ["AAPL", "MSFT", "GOOGL"]
 
-    for ticker in tickers:
-        print(f"\nAnalyzing {ticker}...")
-        results = await analyze_stock(ticker, verbose=False)
+    print(f"Analyzing {', '.join(tickers)}...")
+    batch = await analyze_stocks_batch(tickers, max_concurrency=3)
 
+    for ticker, results in zip(tickers, batch):
         # Extract key info
-        verdict = results["verdict"]
-        if verdict["status"] == "success":
+        verdict = results.get("verdict", {})
+        if verdict.get("status") == "success":
             # Simple parsing - in production you'd want more robust extraction
-            verdict_text = verdict["verdict"]
+            verdict_text = dumps(verdict["verdict"])
             print(f"\n{ticker} Analysis Complete:")
             print(f"Status: {verdict['status']}")
             print(f"Preview: {verdict_text[:200]}...")
         else:
-            print(f"{ticker} Error: {verdict.get('verdict', 'Unknown error')}")
+            print(f"{ticker} Error: {verdict.get('verdict', results.get('error', 'Unknown error'))}")
 
 
 async def example_custom_processing():
@@ -88,17 +90,59 @@ async def example_custom_processing():
         }
 
         print("\nProcessed Summary:")
-        print(json.dumps(summary, indent=2))
+        print(dumps(summary, indent=True))
 
         # Save to file
         output_file = f"analysis_{results['stock_ticker']}.json"
-        with open(output_file, 'w') as f:
-            json.dump(results, f, indent=2)
+        with open(output_file, 'wb') as f:
+            f.write(dumps_bytes(results, indent=True))
         print(f"\nFull results saved to: {output_file}")
 
 
+def _ainput(prompt: str) -> "asyncio.Future[str]":
+    """
+    input() without blocking the event loop. The read runs on a daemon thread
+    rather than in the default executor, which asyncio.run() joins on exit, so
+    Ctrl-C at the prompt doesn't hang until Enter is pressed.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def resolve(value=None, error=None):
+        if future.done():  # e.g. cancelled by Ctrl-C
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(value)
+
+    def read():
+        try:
+            line = input(prompt)
+        except Exception as e:  # e.g. EOFError when stdin is closed
+            line, error = None, e
+        else:
+            error = None
+        try:
+            loop.call_soon_threadsafe(resolve, line, error)
+        except RuntimeError:
+            pass  # the loop is already closed
+
+    threading.Thread(target=read, name="example-input", daemon=True).start()
+    return future
+
+
 async def main():
     """Run all examples."""
+    await init_swarm()
+    try:
+        await run_examples()
+    finally:
+        await shutdown_swarm()
+
+
+async def run_examples():
+    """Prompt for an example and run it."""
     # Choose which example to run
     print("InvestSwarm Examples\n")
     print("Choose an example:")
@@ -107,7 +151,23 @@ async def main():
     print("3. Custom processing (NVDA)")
     print("4. Run all examples")
 
-    choice = input("\nEnter choice (1-4): ").strip()
+    # Options 1 and 4 (and the fallback) start with TSLA, so warm the cache
+    # while the user is still choosing; pointless when results aren't cached
+    prefetch = None
+    if config.cache_ttl_seconds > 0:
+        prefetch = asyncio.ensure_future(analyze_stock("TSLA", verbose=False))
+
+    choice = (await _ainput("\nEnter choice (1-4): ")).strip()
+
+    if prefetch is None:
+        pass
+    elif choice in ("2", "3"):
+        prefetch.cancel()
+    else:
+        try:
+            await prefetch
+        except Exception:
+            pass  # example_basic re-runs the analysis and reports the error
 
     if choice == "1":
         await example_basic()
@@ -125,6 +185,13 @@ async def main():
 
 
 if __name__ == "__main__":
+    try:
+        # Optional: faster libuv-based event loop on Linux/macOS
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -2,11 +2,11 @@
 import asyncio
 import argparse
 import sys
-import json
 from datetime import datetime
 
-from src.swarm import analyze_stock
+from src.utils.json_utils import dumps, dumps_bytes
 from src.utils.logger import logger
+from src.utils.validation import validate_ticker
 
 
 def print_banner():
@@ -22,8 +22,6 @@ def print_banner():
 
 
 def print_verdict(verdict_data: dict):
-    import json as _json
-
     print("\n" + "=" * 80)
     print("FINAL VERDICT")
     print("=" * 80 + "\n")
@@ -31,10 +29,12 @@ def print_verdict(verdict_data: dict):
     status = verdict_data.get("status", "error")
     verdict = verdict_data.get("verdict", "Unknown verdict")
 
-    if status == "success":
+    if status == "success" or verdict_data.get("partial_verdict"):
+        if status != "success":
+            print("(Partial verdict - the judge timed out while streaming)\n")
         # Pretty-print dict or list results
         if isinstance(verdict, (dict, list)):
-            print(_json.dumps(verdict, indent=2, ensure_ascii=False))
+            print(dumps(verdict, indent=True))
         else:
             print(str(verdict))
     else:
@@ -44,6 +44,12 @@ def print_verdict(verdict_data: dict):
 
 
 
+def _preview(obj, n: int = 500) -> str:
+    # Agents return either plain text or parsed JSON; serialize the latter once
+    s = obj if isinstance(obj, str) else dumps(obj)
+    return s if len(s) <= n else s[:n] + "..."
+
+
 def print_research_summary(research_data: dict):
     print("\n" + "=" * 80)
     print("RESEARCH SUMMARY")
@@ -59,18 +65,17 @@ def print_research_summary(research_data: dict):
 
         if status == "success":
             analysis = agent_result.get("analysis", "No analysis available")
-            preview = analysis[:500] + "..." if len(analysis) > 500 else analysis
-            print(f"\nPreview:\n{preview}\n")
+            print(f"\nPreview:\n{_preview(analysis)}\n")
         else:
-            print(f"Error: {agent_result.get('analysis', 'Unknown error')}\n")
+            print(f"Error: {_preview(agent_result.get('analysis', 'Unknown error'))}\n")
 
     print("=" * 80)
 
 
 def save_results(results: dict, output_file: str):
     try:
-        with open(output_file, 'w') as f:
-            json.dump(results, f, indent=2)
+        with open(output_file, 'wb') as f:
+            f.write(dumps_bytes(results, indent=True))
         logger.info(f"\nResults saved to: {output_file}")
     except Exception as e:
         logger.error(f"Failed to save results: {str(e)}")
@@ -86,6 +91,7 @@ Examples:
   python main.py AAPL -o results.json    # Analyze Apple and save to file
   python main.py MSFT --show-research    # Show detailed research from all agents
   python main.py NVDA -q                 # Quiet mode, only show verdict
+  python main.py AMD --no-cache          # Force a fresh analysis
         """
     )
 
@@ -113,6 +119,12 @@ Examples:
         help="Quiet mode - only show final verdict"
     )
 
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Don't reuse cached analyses or model outputs"
+    )
+
     parser.add_argument(
         "--no-banner",
         action="store_true",
@@ -131,15 +143,27 @@ Examples:
         print_banner()
 
     # Validate ticker
-    ticker = args.ticker.upper()
-    if not ticker.isalnum() or len(ticker) > 5:
-        logger.error("Invalid ticker symbol. Please use 1-5 alphanumeric characters.")
+    try:
+        ticker = validate_ticker(args.ticker)
+    except ValueError as e:
+        logger.error(str(e))
         sys.exit(1)
 
     # Run analysis
     try:
+        # Deferred so --help, --version and bad tickers don't pay for importing the agents
+        from src.swarm import analyze_stock
+        from src.utils.cache import set_caching
+        from src.utils.http import close_shared_client
+
+        if args.no_cache:
+            set_caching(False)
+
         verbose = not args.quiet
-        results = await analyze_stock(ticker, verbose=verbose)
+        try:
+            results = await analyze_stock(ticker, verbose=verbose)
+        finally:
+            await close_shared_client()
 
         if args.show_research and not args.quiet:
             print_research_summary(results["research"])
@@ -166,4 +190,11 @@ Examples:
 
 
 if __name__ == "__main__":
+    try:
+        # Optional: faster libuv-based event loop on Linux/macOS
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     asyncio.run(main())
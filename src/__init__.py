@@ -1,15 +1,36 @@
-
-
-from .swarm import InvestSwarm, analyze_stock
-from .agents import FinancialAgent, MarketAgent, SentimentAgent, JudgeAgent
+import importlib
 
 __version__ = "0.1.0"
 
 __all__ = [
     "InvestSwarm",
     "analyze_stock",
+    "analyze_stocks_batch",
+    "init_swarm",
+    "shutdown_swarm",
     "FinancialAgent",
     "MarketAgent",
     "SentimentAgent",
     "JudgeAgent",
 ]
+
+# Resolved on first access so importing src.utils doesn't pull in the agents,
+# dedalus_labs and config (which requires DEDALUS_API_KEY)
+_LAZY_EXPORTS = {
+    "InvestSwarm": ".swarm",
+    "analyze_stock": ".swarm",
+    "analyze_stocks_batch": ".swarm",
+    "init_swarm": ".swarm",
+    "shutdown_swarm": ".swarm",
+    "FinancialAgent": ".agents",
+    "MarketAgent": ".agents",
+    "SentimentAgent": ".agents",
+    "JudgeAgent": ".agents",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module, __name__), name)
@@ -0,0 +1,95 @@
+"""Shared Dedalus client for InvestSwarm agents."""
+import asyncio
+import inspect
+import random
+import weakref
+from typing import Any, Callable, Optional
+
+import httpx
+from dedalus_labs import AsyncDedalus, DedalusRunner, RateLimitError
+
+from ..config import config
+from ..utils.http import get_shared_client
+
+_runner: Optional[DedalusRunner] = None
+_runner_http: Optional[httpx.AsyncClient] = None
+
+# One per event loop: a semaphore binds to the loop that first waits on it, so
+# a later asyncio.run() in the same process needs its own
+_llm_sems: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_runner() -> DedalusRunner:
+    # One client per process on the shared connection pool, so keep-alive
+    # connections are reused across subtasks, agents and repeated tickers.
+    # Rebuilt whenever the pool is replaced (closed, or a new event loop).
+    global _runner, _runner_http
+    http_client = get_shared_client()
+    if _runner is None or _runner_http is not http_client:
+        _runner = DedalusRunner(AsyncDedalus(http_client=http_client))
+        _runner_http = http_client
+    return _runner
+
+
+def llm_semaphore() -> asyncio.Semaphore:
+    # Shared by every agent, so the combined fan-out stays under provider rate limits
+    loop = asyncio.get_running_loop()
+    sem = _llm_sems.get(loop)
+    if sem is None:
+        sem = _llm_sems[loop] = asyncio.Semaphore(config.max_llm_concurrency)
+    return sem
+
+
+async def run_model(runner: DedalusRunner, timeout: Optional[float] = None, **kwargs: Any) -> Any:
+    """
+    Non-streaming runner.run() under the shared concurrency limit.
+    Rate-limited calls are retried with exponential backoff and full jitter;
+    the slot is released while backing off. `timeout` applies per attempt.
+    """
+    for attempt in range(config.llm_max_retries + 1):
+        try:
+            async with llm_semaphore():
+                call = runner.run(stream=False, **kwargs)
+                return await (asyncio.wait_for(call, timeout) if timeout else call)
+        except RateLimitError:
+            if attempt == config.llm_max_retries:
+                raise
+        await asyncio.sleep(random.uniform(0, min(30.0, 2 ** attempt)))
+
+
+def _delta_text(chunk: Any) -> str:
+    # Stream events are chat-completion chunks; tolerate plain strings too
+    if isinstance(chunk, str):
+        return chunk
+    choices = getattr(chunk, "choices", None)
+    if not choices:
+        return ""
+    delta = getattr(choices[0], "delta", None)
+    return getattr(delta, "content", None) or ""
+
+
+async def stream_model(runner: DedalusRunner, on_text: Callable[[str], None], **kwargs: Any) -> None:
+    """
+    Streaming runner.run() under the shared concurrency limit; each text delta
+    is handed to `on_text` as it arrives. Rate limits are retried like
+    run_model() as long as nothing has been streamed yet.
+    """
+    for attempt in range(config.llm_max_retries + 1):
+        received = False
+        try:
+            async with llm_semaphore():
+                stream = runner.run(stream=True, **kwargs)
+                if inspect.isawaitable(stream):
+                    stream = await stream
+                async for chunk in stream:
+                    text = _delta_text(chunk)
+                    if text:
+                        received = True
+                        on_text(text)
+                return
+        except RateLimitError:
+            if received or attempt == config.llm_max_retries:
+                raise
+        await asyncio.sleep(random.uniform(0, min(30.0, 2 ** attempt)))
@@ -0,0 +1,10 @@
+"""Prompt pieces shared by the research agents."""
+
+# Identical first bytes for every agent's reduce call, so providers can reuse
+# one cached prefix across agents and runs
+REDUCE_PREFIX = "You are a domain judge synthesizing partial analyses. Produce STRICT JSON only. No prose.\n\n"
+
+
+def render_reduce(schema_block: str, micro_json: str, ticker: str) -> str:
+    # Static prefix and per-agent schema first; per-run data, ticker last
+    return "".join([REDUCE_PREFIX, schema_block, "Input:\n", micro_json, "\nStock: ", ticker, "\n"])
@@ -1,12 +1,14 @@
 """Financial Analysis Agent."""
-from ..utils.json_utils import parse_model_json
-from dataclasses import dataclass
-import asyncio, json
-
-from dedalus_labs import AsyncDedalus, DedalusRunner
-from typing import Dict, Any
+from ..utils.cache import AsyncTTLCache, hash_key
+from ..utils.json_utils import dumps, parse_model_json
+from collections import Counter
+from statistics import mean, pstdev
+import asyncio
+from typing import Dict, Any, List, Optional, Sequence, Tuple, NamedTuple
 
 from ..config import config
+from ._dedalus import get_runner, run_model
+from ._prompts import render_reduce
 from ..tools import (
     calculate_financial_ratios,
     calculate_valuation_metrics,
@@ -14,96 +16,179 @@ from ..tools import (
     execute_python_code,
 )
 
+# Subtask outputs keyed by (model, MCP servers, prompt); concurrent identical
+# subtasks, e.g. the same ticker analyzed twice at once, share one call
+_SUBTASK_CACHE = AsyncTTLCache(ttl=config.cache_ttl_seconds, maxsize=512)
+
+
+# Micro prompt pieces, joined around the ticker and the subtask instruction
+_MICRO_HEAD = "You are a financial analysis expert analyzing "
+_MICRO_MID = ".\nTask: "
+_MICRO_TAIL = """
+Return STRICT JSON:
+{
+  "summary": "≤120 words",
+  "metrics": [{"name": "string", "value": "string"}],
+  "strengths": ["string", ...],
+  "weaknesses": ["string", ...],
+  "stance": "BULLISH|BEARISH|NEUTRAL",
+  "confidence": 0-10
+}
+Only JSON. No prose outside the JSON.
+"""
+
+# Reduce schema for this agent; see _prompts.render_reduce for the full layout
+_REDUCE_SCHEMA = """You are the financial judge. The input is a JSON list of partial analyses of one stock.
+Summarize overlaps/conflicts and output final structured JSON:
+{
+  "overall_summary": "≤150 words",
+  "key_strengths": ["≤5 bullets"],
+  "key_weaknesses": ["≤5 bullets"],
+  "overall_stance": "BULLISH|BEARISH|NEUTRAL",
+  "confidence": 0-10
+}
+"""
+
+
+def _render(ticker: str, instruction: str) -> str:
+    return "".join([_MICRO_HEAD, ticker, _MICRO_MID, instruction, _MICRO_TAIL])
+
+
+async def _wait_for_quorum(tasks: Sequence[asyncio.Future], quorum: int) -> None:
+    pending = set(tasks)
+    while pending and len(tasks) - len(pending) < quorum:
+        _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+
+def _snapshot(tasks: Sequence[asyncio.Future], names: Sequence[str]) -> List[Dict[str, Any]]:
+    # Finished results in subtask order, with placeholders for stragglers
+    return [
+        task.result() if task.done() and not task.cancelled()
+        else {"summary": f"{name} did not finish before the reduce step", "confidence": 0}
+        for task, name in zip(tasks, names)
+    ]
+
+
+def _unique_strings(micro_results: Sequence[Dict[str, Any]], field: str, limit: int = 5) -> List[str]:
+    items = (x for r in micro_results for x in (r.get(field) or []) if isinstance(x, str))
+    return list(dict.fromkeys(items))[:limit]
+
+
+def _local_reduce(micro_results: Sequence[Any], min_votes: int, max_stdev: float) -> Optional[Dict[str, Any]]:
+    """
+    Synthesize the reduce output in Python when the micro results already agree:
+    at least `min_votes` share a stance and their confidences are tightly clustered.
+    Returns None when the LLM reduce is still needed.
+    """
+    scored = [r for r in micro_results if isinstance(r, dict) and r.get("stance")]
+    stances = Counter(str(r["stance"]).upper() for r in scored)
+    if not stances:
+        return None
+    stance, votes = stances.most_common(1)[0]
+    if votes < min_votes:
+        return None
+
+    try:
+        confidences = [float(r.get("confidence", 0)) for r in scored]
+    except (TypeError, ValueError):
+        return None
+    if pstdev(confidences) >= max_stdev:
+        return None
+
+    return {
+        "overall_summary": " ".join(str(r.get("summary", "")) for r in scored)[:600],
+        "key_strengths": _unique_strings(scored, "strengths"),
+        "key_weaknesses": _unique_strings(scored, "weaknesses"),
+        "overall_stance": stance,
+        "confidence": round(mean(confidences)),
+    }
+
+
+_MCP_SERVERS: Tuple[str, ...] = (config.brave_search_mcp, config.exa_mcp, config.sonar)
+_FINANCIAL_TOOLS = (
+    calculate_financial_ratios,
+    calculate_valuation_metrics,
+    analyze_growth_trends,
+    execute_python_code,
+)
+
+
+class Subtask(NamedTuple):
+    name: str
+    instruction: str
+    timeout_s: int = 200
+
+
+_FINANCIAL_SUBTASKS: Tuple[Subtask, ...] = (
+    Subtask("financial_health", "Evaluate the most recent 2025 liquidity, solvency, and key ratios (profit margin, ROE, ROA, debt-to-equity). Use sonar to retrieve the most accurate and recent financial data"),
+    Subtask("profitability", "Analyze the most recent 2025 revenue, net income, and margin trends over the past 3-5 years. Use sonar to retrieve the most accurate and recent financial data"),
+    Subtask("valuation", "Compute or summarize the most recent 2025 valuation metrics (P/E, P/B, EV/EBITDA) and compare to peers. Use sonar to retrieve the most accurate and recent financial data"),
+    Subtask("cash_flow", "Assess the most recent 2025 operating cash flow, free cash flow, and capex requirements. Use sonar to retrieve the most accurate and recent financial data"),
+    Subtask("balance_sheet", "Review the most recent 2025 debt levels, cash reserves, and asset quality. Use sonar to retrieve the most accurate and recent financial data"),
+)
+
 
 class FinancialAgent:
+    # Subtasks that must finish before the reduce step starts
+    subtask_quorum = 4
+    # Skip the LLM reduce when this many subtasks agree on the stance...
+    consensus_votes = 4
+    # ...and their confidences have a population stdev below this
+    consensus_max_stdev = 1.0
 
     def __init__(self):
         self.name = "Financial Analysis Agent"
         self.model = config.financial_model
-        self.mcp_servers = [config.brave_search_mcp, config.exa_mcp, config.sonar]
-        self.tools = [
-            calculate_financial_ratios,
-            calculate_valuation_metrics,
-            analyze_growth_trends,
-            execute_python_code,
-        ]
+        self.mcp_servers = _MCP_SERVERS
+        self.tools = _FINANCIAL_TOOLS
 
     async def analyze(self, stock_ticker: str) -> Dict[str, Any]:
-        @dataclass
-        class Subtask:
-            name: str
-            instruction: str
-            timeout_s: int = 200
-
-        subtasks = [
-            Subtask("financial_health", "Evaluate the most recent 2025 liquidity, solvency, and key ratios (profit margin, ROE, ROA, debt-to-equity). Use sonar to retrieve the most accurate and recent financial data"),
-            Subtask("profitability", "Analyze the most recent 2025 revenue, net income, and margin trends over the past 3-5 years. Use sonar to retrieve the most accurate and recent financial data"),
-            Subtask("valuation", "Compute or summarize the most recent 2025 valuation metrics (P/E, P/B, EV/EBITDA) and compare to peers. Use sonar to retrieve the most accurate and recent financial data"),
-            Subtask("cash_flow", "Assess the most recent 2025 operating cash flow, free cash flow, and capex requirements. Use sonar to retrieve the most accurate and recent financial data"),
-            Subtask("balance_sheet", "Review the most recent 2025 debt levels, cash reserves, and asset quality. Use sonar to retrieve the most accurate and recent financial data"),
-        ]
-
-        MICRO_PROMPT = """You are a financial analysis expert analyzing {ticker}.
-    Task: {instruction}
-    Return STRICT JSON:
-    {{
-    "summary": "≤120 words",
-    "metrics": [{{"name": "string", "value": "string"}}],
-    "strengths": ["string", ...],
-    "weaknesses": ["string", ...],
-    "stance": "BULLISH|BEARISH|NEUTRAL",
-    "confidence": 0-10
-    }}
-    Only JSON. No prose outside the JSON.
-    """
-
         async def run_subtask(runner, subtask):
-            prompt = MICRO_PROMPT.format(ticker=stock_ticker, instruction=subtask.instruction)
-            try:
-                result = await asyncio.wait_for(
-                    runner.run(
-                        input=prompt,
-                        model=self.model,
-                        tools=self.tools,
-                        mcp_servers=self.mcp_servers,
-                        stream=False
-                    ),
-                    timeout=subtask.timeout_s
+            prompt = _render(stock_ticker, subtask.instruction)
+
+            async def call_model() -> str:
+                result = await run_model(
+                    runner,
+                    timeout=subtask.timeout_s,
+                    input=prompt,
+                    model=self.model,
+                    tools=self.tools,
+                    mcp_servers=self.mcp_servers,
                 )
-                return parse_model_json(result.final_output)
+                parse_model_json(result.final_output)  # only cache well-formed output
+                return result.final_output
+
+            try:
+                key = hash_key(self.model, *self.mcp_servers, prompt)
+                return parse_model_json(await _SUBTASK_CACHE.get_or_load(key, call_model))
             except Exception as e:
                 return {"summary": f"{subtask.name} failed: {e}", "confidence": 0}
 
-        client = AsyncDedalus()
-        runner = DedalusRunner(client)
-        micro_results = await asyncio.gather(*[run_subtask(runner, s) for s in subtasks])
-
-        # Reduce
-        reduce_prompt = f"""You are the financial judge synthesizing multiple partial analyses of {stock_ticker}.
-    Input JSON list below. Summarize overlaps/conflicts and output final structured JSON:
-    {{
-    "overall_summary": "≤150 words",
-    "key_strengths": ["≤5 bullets"],
-    "key_weaknesses": ["≤5 bullets"],
-    "overall_stance": "BULLISH|BEARISH|NEUTRAL",
-    "confidence": 0-10
-    }}
-    Input:
-    {json.dumps(micro_results, ensure_ascii=False)}
-    Return only JSON.
-    """
-
+        runner = get_runner()
+        names = [s.name for s in _FINANCIAL_SUBTASKS]
+        tasks = [asyncio.ensure_future(run_subtask(runner, s)) for s in _FINANCIAL_SUBTASKS]
         try:
-            reduce_result = await runner.run(
-                input=reduce_prompt,
-                model="openai/gpt-5", 
-                stream=False
-            )
-            final_json = parse_model_json(reduce_result.final_output)
+            await _wait_for_quorum(tasks, self.subtask_quorum)
+
+            # Reduce over the quorum; stragglers would only hold a concurrency
+            # slot through the reduce without changing its input
+            micro_results = _snapshot(tasks, names)
+            for task in tasks:
+                task.cancel()
+            final_json = _local_reduce(micro_results, self.consensus_votes, self.consensus_max_stdev)
             status = "success"
-        except Exception as e:
-            final_json = {"error": str(e), "partials": micro_results}
-            status = "partial"
+
+            if final_json is None:
+                reduce_prompt = render_reduce(_REDUCE_SCHEMA, dumps(micro_results), stock_ticker)
+                try:
+                    reduce_result = await run_model(runner, input=reduce_prompt, model="openai/gpt-5")
+                    final_json = parse_model_json(reduce_result.final_output)
+                except Exception as e:
+                    final_json = {"error": str(e), "partials": micro_results}
+                    status = "partial"
+        finally:
+            for task in tasks:
+                task.cancel()
 
         return {
             "agent": "financial",
@@ -1,120 +1,106 @@
 
 
-from dataclasses import dataclass
-import asyncio, json
-from typing import List, Dict, Any
+import asyncio
+from typing import List, Dict, Any, Optional, Tuple, NamedTuple
 
-from dedalus_labs import AsyncDedalus, DedalusRunner
 from ..config import config
-from ..utils.json_utils import parse_model_json
+from ._dedalus import get_runner, run_model, stream_model
+from ..utils.cache import AsyncTTLCache, hash_key
+from ..utils.json_utils import IncrementalJsonParser, dumps, parse_model_json
 
+try:
+    # Optional: pip install msgspec
+    import msgspec
+except ImportError:
+    msgspec = None
 
-class JudgeAgent:
+if msgspec is not None:
+    class MicroResult(msgspec.Struct):
+        summary: str
+        bullets: List[str] = []
+        stance_hint: str = "UNKNOWN"
+        confidence_hint: int = 0
 
-    def __init__(self):
-        self.name = "Judge & Verdict Agent"
-        self.model = "openai/gpt-5"
-        self.mcp_servers: List[str] = []
-        self.tools: List[Any] = []
+    _MICRO_DECODER = msgspec.json.Decoder(MicroResult)
+    _FAN_OUT_DECODER = msgspec.json.Decoder(Dict[str, MicroResult])
+
+
+def _parse_micro(text: str, fan_out: bool) -> Dict[str, Any]:
+    # Clean, schema-conforming output is decoded and validated in one pass;
+    # anything else (fences, prose, loose types) goes through the tolerant parser
+    if msgspec is not None:
+        try:
+            if fan_out:
+                return {k: msgspec.structs.asdict(v) for k, v in _FAN_OUT_DECODER.decode(text).items()}
+            return msgspec.structs.asdict(_MICRO_DECODER.decode(text))
+        except msgspec.DecodeError:  # also covers ValidationError
+            pass
+    parsed = parse_model_json(text)
+    if not isinstance(parsed, dict):
+        raise ValueError(f"Expected a JSON object, got {type(parsed).__name__}")
+    return parsed
+
+
+# Micro-judgment outputs keyed by (model, prompt). The prompt embeds the ticker,
+# the research inputs and the subtask, so re-judging identical research is free
+_MICRO_CACHE = AsyncTTLCache(ttl=config.cache_ttl_seconds, maxsize=1024)
+
+
+# Fields of the upstream reduce outputs worth showing the judge; everything
+# else (e.g. raw partials) is dropped to keep the shared prefix small
+_IMPORTANT_KEYS = (
+    "overall_summary",
+    "key_strengths",
+    "key_weaknesses",
+    "overall_stance",
+    "confidence",
+    "moat",
+    "news_headlines",
+    "analyst_consensus",
+    "key_risks",
+    "upcoming_catalysts",
+    "error",
+)
+# Roughly 1500 tokens per agent
+MAX_CHARS = 6000
 
-    async def judge(self, research_results: List[Dict[str, Any]], stock_ticker: str) -> Dict[str, Any]:
-        """
-        Batched judging:
-          1) Parallel micro-judgments (summaries, agreements/conflicts, weighing, risks/opps)
-          2) Reduce to final BUY/HOLD/SELL verdict JSON
-        """
-        client = AsyncDedalus()
-        runner = DedalusRunner(client)
-
-        compact_inputs = []
-        for r in research_results:
-            compact_inputs.append({
-                "agent": r.get("agent"),
-                "agent_name": r.get("agent_name"),
-                "status": r.get("status"),
-                "analysis": r.get("analysis"),  
-            })
-        inputs_json = json.dumps(compact_inputs, ensure_ascii=False)
-
-        @dataclass
-        class Subtask:
-            name: str
-            instruction: str
-            timeout_s: int = 120  
-
-        subtasks = [
-            Subtask(
-                "summarize_financial",
-                "Summarize the Financial agent’s core arguments, stance, and confidence (≤120 words)."
-            ),
-            Subtask(
-                "summarize_market",
-                "Summarize the Market & Product agent’s core arguments, stance, and confidence (≤120 words)."
-            ),
-            Subtask(
-                "summarize_sentiment",
-                "Summarize the Sentiment agent’s core arguments, stance, and confidence (≤120 words)."
-            ),
-            Subtask(
-                "agreements_conflicts",
-                "Identify agreements and conflicts across the three agents. Be precise and cite which agents agree/disagree."
-            ),
-            Subtask(
-                "weigh_evidence",
-                "Weigh the evidence across fundamentals, market position, and sentiment. Prioritize quantitative/verified points."
-            ),
-            Subtask(
-                "risks_opportunities",
-                "List top risks (≤5) and top opportunities (≤5) that are most decision-relevant."
-            ),
-        ]
-
-        MICRO_PROMPT = """You are the investment judge for {ticker}.
-You will receive a JSON array of agent analyses:
-{inputs}
 
-Task: {instruction}
+def _compact_analysis(analysis: Any) -> Any:
+    if isinstance(analysis, dict):
+        compact = {k: analysis[k] for k in _IMPORTANT_KEYS if analysis.get(k) not in (None, "", [], {})}
+        if any(k != "error" for k in compact):
+            return compact
+        # Only an error (or nothing recognizable): keep a bounded slice of the raw output
+        analysis = dumps(analysis)
+    if isinstance(analysis, str):
+        return analysis[:MAX_CHARS]
+    return analysis
+
+
+# Micro-judgment prompt prefix pieces, joined around the ticker and the
+# serialized research inputs; each subtask appends its instruction
+_PREFIX_HEAD = "You are the investment judge for "
+_PREFIX_MID = """.
+You will receive a JSON array of agent analyses:
+"""
+_PREFIX_TAIL = """
 
 Return STRICT JSON ONLY:
-{{
+{
   "summary": "≤120 words",
   "bullets": ["string", ...],
   "stance_hint": "BULLISH|BEARISH|NEUTRAL|MIXED|UNKNOWN",
   "confidence_hint": 0-10
-}}
+}
 No prose outside JSON. No code fences.
-"""
-
-        async def run_subtask(subtask: Subtask):
-            prompt = MICRO_PROMPT.format(ticker=stock_ticker, inputs=inputs_json, instruction=subtask.instruction)
-            try:
-                result = await asyncio.wait_for(
-                    runner.run(
-                        input=prompt,
-                        model=self.model,   # keep simple; no tools/MCPs
-                        stream=False
-                    ),
-                    timeout=subtask.timeout_s
-                )
-                return parse_model_json(result.final_output)
-            except Exception as e:
-                return {
-                    "summary": f"{subtask.name} failed: {e}",
-                    "bullets": [],
-                    "stance_hint": "UNKNOWN",
-                    "confidence_hint": 0
-                }
 
-        micro_results = await asyncio.gather(*[run_subtask(s) for s in subtasks])
+Task: """
 
-        # Reduce
-        reduce_prompt = f"""You are a senior portfolio manager. Synthesize the following micro-judgments for {stock_ticker}:
-
-Micro-judgments JSON:
-{json.dumps(micro_results, ensure_ascii=False)}
+# Reduce prompt pieces: static schema and guidelines first, per-run data last
+_REDUCE_HEAD = """You are a senior portfolio manager. Synthesize the micro-judgments below into a final verdict.
 
 Produce FINAL VERDICT in STRICT JSON ONLY with this schema:
-{{
+{
   "recommendation": "BUY|HOLD|SELL",
   "conviction": 1-10,
   "timeframe": "SHORT|MEDIUM|LONG|N/A",
@@ -122,30 +108,191 @@ Produce FINAL VERDICT in STRICT JSON ONLY with this schema:
   "key_reasoning": ["3-5 bullets"],
   "main_risks": ["≤5 bullets"],
   "monitoring": ["≤5 bullets"]
-}}
+}
 Guidelines:
 - Be decisive but honest about uncertainty. Defer to BUY or SELL more often then HOLD.
 - Use micro-judgments’ stance/confidence hints to calibrate.
 - If upstream inputs were partial/missing, reflect that with lower conviction.
 - No prose outside JSON. No code fences.
+
+Stock: """
+_REDUCE_MID = """
+Micro-judgments JSON:
 """
 
+
+class JudgePrep(NamedTuple):
+    # Everything judge() needs that doesn't depend on the research results
+    runner: Any
+    prefix_head: str
+    reduce_head: str
+
+
+class Subtask(NamedTuple):
+    name: str
+    instruction: str
+    timeout_s: int = 120
+    # When set, the response is an object keyed by these names and is
+    # unpacked into one micro-judgment per key
+    fan_out: Tuple[str, ...] = ()
+
+
+_JUDGE_SUBTASKS: Tuple[Subtask, ...] = (
+    Subtask(
+        "summarize",
+        "For EACH of the Financial, Market & Product, and Sentiment agents, summarize its core arguments, "
+        "stance, and confidence (≤120 words each). Return one JSON object "
+        '{"financial": {...}, "market": {...}, "sentiment": {...}} where each value follows the schema above.',
+        timeout_s=180,
+        fan_out=("financial", "market", "sentiment"),
+    ),
+    Subtask(
+        "agreements_conflicts",
+        "Identify agreements and conflicts across the three agents. Be precise and cite which agents agree/disagree."
+    ),
+    Subtask(
+        "weigh_evidence",
+        "Weigh the evidence across fundamentals, market position, and sentiment. Prioritize quantitative/verified points."
+    ),
+    Subtask(
+        "risks_opportunities",
+        "List top risks (≤5) and top opportunities (≤5) that are most decision-relevant."
+    ),
+)
+
+
+class JudgeAgent:
+    # Budget for the streamed reduce; on expiry the parsed-so-far verdict is returned
+    reduce_timeout_s = 240
+
+    def __init__(self):
+        self.name = "Judge & Verdict Agent"
+        self.model = "openai/gpt-5"
+        self.mcp_servers: List[str] = []
+        self.tools: List[Any] = []
+
+    def prepare_input(self, research_result: Dict[str, Any]) -> str:
+        """
+        Compact and serialize one research result for the judge prompt.
+        Callers can run this as each agent finishes and pass the pieces to judge().
+        """
+        return dumps({
+            "agent": research_result.get("agent"),
+            "agent_name": research_result.get("agent_name"),
+            "status": research_result.get("status"),
+            "analysis": _compact_analysis(research_result.get("analysis")),
+        })
+
+    def prepare(self, stock_ticker: str) -> JudgePrep:
+        """
+        Build the research-independent parts of the judge run: the client and
+        the ticker-specific prompt heads. Can be built before research finishes.
+        """
+        return JudgePrep(
+            runner=get_runner(),
+            prefix_head="".join([_PREFIX_HEAD, stock_ticker, _PREFIX_MID]),
+            reduce_head="".join([_REDUCE_HEAD, stock_ticker, _REDUCE_MID]),
+        )
+
+    async def judge(
+        self,
+        research_results: List[Dict[str, Any]],
+        stock_ticker: str,
+        prepared_inputs: Optional[List[str]] = None,
+        prep: Optional[JudgePrep] = None,
+    ) -> Dict[str, Any]:
+        """
+        Batched judging:
+          1) Parallel micro-judgments (one batched summary of all agents, agreements/conflicts,
+             weighing, risks/opps)
+          2) Reduce to final BUY/HOLD/SELL verdict JSON
+        `prepared_inputs`, if given, holds prepare_input() of each research result, in order;
+        `prep`, if given, is the result of prepare() for this ticker.
+        """
+        if prep is None:
+            prep = self.prepare(stock_ticker)
+        runner = prep.runner
+
+        if prepared_inputs is None:
+            prepared_inputs = [self.prepare_input(r) for r in research_results]
+        inputs_json = "[" + ",".join(prepared_inputs) + "]"
+
+        # Rendered once and shared by every subtask. Everything up to "Task:" is
+        # identical across calls, so providers can serve it from their prefix cache.
+        prompt_prefix = "".join([prep.prefix_head, inputs_json, _PREFIX_TAIL])
+
+        def failed(name: str, error: Any) -> Dict[str, Any]:
+            return {
+                "summary": f"{name} failed: {error}",
+                "bullets": [],
+                "stance_hint": "UNKNOWN",
+                "confidence_hint": 0
+            }
+
+        async def run_subtask(subtask: Subtask) -> List[Dict[str, Any]]:
+            prompt = prompt_prefix + subtask.instruction + "\n"
+
+            async def call_model() -> str:
+                result = await run_model(
+                    runner,
+                    timeout=subtask.timeout_s,
+                    input=prompt,
+                    model=self.model,   # keep simple; no tools/MCPs
+                )
+                _parse_micro(result.final_output, bool(subtask.fan_out))  # only cache well-formed output
+                return result.final_output
+
+            try:
+                raw = await _MICRO_CACHE.get_or_load(hash_key(self.model, prompt), call_model)
+                parsed = _parse_micro(raw, bool(subtask.fan_out))
+            except Exception as e:
+                if subtask.fan_out:
+                    return [failed(f"{subtask.name}_{key}", e) for key in subtask.fan_out]
+                return [failed(subtask.name, e)]
+
+            if not subtask.fan_out:
+                return [parsed]
+            return [
+                parsed[key] if isinstance(parsed.get(key), dict) else failed(f"{subtask.name}_{key}", "missing from response")
+                for key in subtask.fan_out
+            ]
+
+        batches = await asyncio.gather(*[run_subtask(s) for s in _JUDGE_SUBTASKS])
+        micro_results = [r for batch in batches for r in batch]
+
+        # Reduce
+        reduce_prompt = "".join([prep.reduce_head, dumps(micro_results), "\n"])
+
+        # Stream the verdict so it is parsed as it arrives; if the stream is cut
+        # off by the timeout, whatever complete fields have landed are returned
+        parser = IncrementalJsonParser()
+        partial_verdict = False
         try:
-            reduce_result = await runner.run(
-                input=reduce_prompt,
-                model=self.model, 
-                stream=False
+            await asyncio.wait_for(
+                stream_model(runner, parser.feed, input=reduce_prompt, model=self.model),
+                self.reduce_timeout_s,
             )
-            final_json = parse_model_json(reduce_result.final_output)
+            final_json = parse_model_json(parser.text)
             status = "success"
+        except asyncio.TimeoutError:
+            snapshot = parser.snapshot()
+            if snapshot:
+                final_json = snapshot
+                partial_verdict = True
+            else:
+                final_json = {"error": f"reduce timed out after {self.reduce_timeout_s}s", "partials": micro_results}
+            status = "partial"
         except Exception as e:
             final_json = {"error": str(e), "partials": micro_results}
             status = "partial"
 
-        return {
+        result = {
             "agent": "judge",
             "agent_name": self.name,
             "verdict": final_json,
             "status": status,
             "stock_ticker": stock_ticker
         }
+        if partial_verdict:
+            result["partial_verdict"] = True
+        return result
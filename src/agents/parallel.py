@@ -0,0 +1,15 @@
+"""Timeout helper for the research agents' concurrent fan-out."""
+import asyncio
+from typing import Awaitable, TypeVar
+
+T = TypeVar("T")
+
+
+async def with_timeout(aw: Awaitable[T], timeout: float, label: str) -> T:
+    """Await `aw`, bounded by `timeout` seconds (0 or less means no bound)."""
+    if timeout <= 0:
+        return await aw
+    try:
+        return await asyncio.wait_for(aw, timeout)
+    except asyncio.TimeoutError:
+        raise asyncio.TimeoutError(f"{label} timed out after {timeout:g}s") from None
@@ -1,65 +1,88 @@
 """Sentiment Analysis Agent."""
-from ..utils.json_utils import parse_model_json
-from dataclasses import dataclass
+from ..utils.json_utils import dumps, parse_model_json
 import asyncio
-import json
-from typing import Dict, Any
+from typing import Dict, Any, Tuple, NamedTuple
 
-from dedalus_labs import AsyncDedalus, DedalusRunner
 from ..config import config
+from ._dedalus import get_runner, run_model
+from ._prompts import render_reduce
 from ..tools import score_sentiment, analyze_news_sentiment
 
 
-class SentimentAgent:
-
-    def __init__(self):
-        self.name = "Sentiment Analysis Agent"
-        self.model = config.sentiment_model
-        self.mcp_servers = [config.brave_search_mcp, config.exa_mcp]
-        self.tools = [score_sentiment, analyze_news_sentiment]
-
-    async def analyze(self, stock_ticker: str) -> Dict[str, Any]:
-        @dataclass
-        class Subtask:
-            name: str
-            instruction: str
-            timeout_s: int = 200
-
-        subtasks = [
-            Subtask("news_30d", "Aggregate last 30 days of news tone, key headlines, and trend direction; compute an overall news score."),
-            Subtask("analyst", "Summarize recent analyst ratings/changes and price targets; compute a consensus tilt."),
-            Subtask("social_retail", "Summarize social/retail chatter and velocity; indicate bullish/bearish/neutral with rationale."),
-            Subtask("insiders", "Summarize recent insider transactions and governance signals; indicate alignment or concern."),
-            Subtask("derivatives", "Summarize options/short-interest (put/call, SI %) and what it implies about positioning."),
-            Subtask("catalysts", "List near-term catalysts (earnings, product, regulatory) and expected sentiment impact."),
-        ]
-
-        MICRO_PROMPT = """You are a sentiment analysis expert for {ticker}.
-Task: {instruction}
+# Micro prompt pieces, joined around the ticker and the subtask instruction
+_MICRO_HEAD = "You are a sentiment analysis expert for "
+_MICRO_MID = ".\nTask: "
+_MICRO_TAIL = """
 Return STRICT JSON:
-{{
+{
   "summary": "≤120 words",
-  "metrics": [{{"name": "string", "value": "string"}}],
+  "metrics": [{"name": "string", "value": "string"}],
   "strengths": ["string", ...],
   "weaknesses": ["string", ...],
   "stance": "BULLISH|BEARISH|NEUTRAL",
   "confidence": 0-10
-}}
+}
 Only JSON. No prose outside the JSON.
 """
 
+# Reduce schema for this agent; see _prompts.render_reduce for the full layout
+_REDUCE_SCHEMA = """You are the sentiment judge. The input is a JSON list of partial analyses of one stock.
+Summarize overlaps/conflicts and output final structured JSON:
+{
+  "overall_summary": "≤150 words",
+  "news_headlines": ["≤5 bullets"],
+  "analyst_consensus": "BUY|HOLD|SELL|MIXED|UNKNOWN",
+  "overall_stance": "BULLISH|BEARISH|NEUTRAL",
+  "confidence": 0-10,
+  "key_risks": ["≤5 bullets"],
+  "upcoming_catalysts": ["≤5 bullets"]
+}
+"""
+
+
+def _render(ticker: str, instruction: str) -> str:
+    return "".join([_MICRO_HEAD, ticker, _MICRO_MID, instruction, _MICRO_TAIL])
+
+
+_MCP_SERVERS: Tuple[str, ...] = (config.brave_search_mcp, config.exa_mcp)
+_SENTIMENT_TOOLS = (score_sentiment, analyze_news_sentiment)
+
+
+class Subtask(NamedTuple):
+    name: str
+    instruction: str
+    timeout_s: int = 200
+
+
+_SENTIMENT_SUBTASKS: Tuple[Subtask, ...] = (
+    Subtask("news_30d", "Aggregate last 30 days of news tone, key headlines, and trend direction; compute an overall news score."),
+    Subtask("analyst", "Summarize recent analyst ratings/changes and price targets; compute a consensus tilt."),
+    Subtask("social_retail", "Summarize social/retail chatter and velocity; indicate bullish/bearish/neutral with rationale."),
+    Subtask("insiders", "Summarize recent insider transactions and governance signals; indicate alignment or concern."),
+    Subtask("derivatives", "Summarize options/short-interest (put/call, SI %) and what it implies about positioning."),
+    Subtask("catalysts", "List near-term catalysts (earnings, product, regulatory) and expected sentiment impact."),
+)
+
+
+class SentimentAgent:
+
+    def __init__(self):
+        self.name = "Sentiment Analysis Agent"
+        self.model = config.sentiment_model
+        self.mcp_servers = _MCP_SERVERS
+        self.tools = _SENTIMENT_TOOLS
+
+    async def analyze(self, stock_ticker: str) -> Dict[str, Any]:
         async def run_subtask(runner, subtask: Subtask):
-            prompt = MICRO_PROMPT.format(ticker=stock_ticker, instruction=subtask.instruction)
+            prompt = _render(stock_ticker, subtask.instruction)
             try:
-                result = await asyncio.wait_for(
-                    runner.run(
-                        input=prompt,
-                        model=self.model,
-                        tools=self.tools,
-                        mcp_servers=self.mcp_servers,
-                        stream=False,
-                    ),
+                result = await run_model(
+                    runner,
                     timeout=subtask.timeout_s,
+                    input=prompt,
+                    model=self.model,
+                    tools=self.tools,
+                    mcp_servers=self.mcp_servers,
                 )
                 return parse_model_json(result.final_output)
             except Exception as e:
@@ -72,33 +95,14 @@ Only JSON. No prose outside the JSON.
                     "confidence": 0,
                 }
 
-        client = AsyncDedalus()
-        runner = DedalusRunner(client)
-        micro_results = await asyncio.gather(*[run_subtask(runner, s) for s in subtasks])
+        runner = get_runner()
+        micro_results = await asyncio.gather(*[run_subtask(runner, s) for s in _SENTIMENT_SUBTASKS])
 
         # reduce
-        reduce_prompt = f"""You are the sentiment judge synthesizing multiple partial analyses of {stock_ticker}.
-Input JSON list below. Summarize overlaps/conflicts and output final structured JSON:
-{{
-  "overall_summary": "≤150 words",
-  "news_headlines": ["≤5 bullets"],
-  "analyst_consensus": "BUY|HOLD|SELL|MIXED|UNKNOWN",
-  "overall_stance": "BULLISH|BEARISH|NEUTRAL",
-  "confidence": 0-10,
-  "key_risks": ["≤5 bullets"],
-  "upcoming_catalysts": ["≤5 bullets"]
-}}
-Input:
-{json.dumps(micro_results, ensure_ascii=False)}
-Return only JSON.
-"""
+        reduce_prompt = render_reduce(_REDUCE_SCHEMA, dumps(micro_results), stock_ticker)
 
         try:
-            reduce_result = await runner.run(
-                input=reduce_prompt,
-                model=self.model, 
-                stream=False,
-            )
+            reduce_result = await run_model(runner, input=reduce_prompt, model=self.model)
             final_json = parse_model_json(reduce_result.final_output)
             status = "success"
         except Exception as e:
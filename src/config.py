@@ -1,37 +1,63 @@
 import os
+from dataclasses import dataclass, field
+from typing import ClassVar, Optional, Tuple
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
 
+def _env(name: str, default: Optional[str] = None):
+    return field(default_factory=lambda: os.getenv(name, default))
+
+
+@dataclass(frozen=True)
 class Config:
-    def __init__(self):
-        # Dedalus API Key (required)
-        self.dedalus_api_key = os.getenv("DEDALUS_API_KEY")
+    # Models
+    financial_model: ClassVar[str] = "openai/gpt-5"
+    market_model: ClassVar[str] = "openai/gpt-5"
+    sentiment_model: ClassVar[str] = "openai/gpt-5"
+    judge_models: ClassVar[Tuple[str, ...]] = ("openai/gpt-5", "anthropic/claude-sonnet-4-20250514")
+
+    # MCP servers
+    brave_search_mcp: ClassVar[str] = "windsor/brave-search-mcp"
+    exa_mcp: ClassVar[str] = "joerup/exa-mcp"
+    sonar: ClassVar[str] = "akakak/sonar"
+    yahoo_finance_mcp: ClassVar[str] = "aq_humor/yahoo-finance-mcp"
+
+    # Dedalus API Key (required)
+    dedalus_api_key: Optional[str] = _env("DEDALUS_API_KEY")
+
+    # Optional: User can bring their own API keys
+    openai_api_key: Optional[str] = _env("OPENAI_API_KEY")
+    anthropic_api_key: Optional[str] = _env("ANTHROPIC_API_KEY")
+
+    # Upper bound on simultaneous LLM calls across all agents, to stay under
+    # provider rate limits; rate-limited calls are retried this many times
+    max_llm_concurrency: int = field(default_factory=lambda: int(os.getenv("MAX_LLM_CONCURRENCY", "8")))
+    llm_max_retries: int = field(default_factory=lambda: int(os.getenv("LLM_MAX_RETRIES", "3")))
+
+    # Upper bound in seconds on each research agent's analyze() (0 disables)
+    agent_timeout_s: float = field(default_factory=lambda: float(os.getenv("AGENT_TIMEOUT", "900")))
+
+    # How long a finished analysis is reused for the same ticker (0 disables)
+    cache_ttl_seconds: float = field(default_factory=lambda: float(os.getenv("ANALYSIS_CACHE_TTL", "3600")))
+
+    # Cancel the last research agent once two others agree on the stance with
+    # at least this confidence (0-10); 0 keeps waiting for all three
+    early_consensus_confidence: int = field(
+        default_factory=lambda: int(os.getenv("EARLY_CONSENSUS_CONFIDENCE", "0"))
+    )
+
+    # Logging
+    debug: bool = field(default_factory=lambda: os.getenv("DEBUG", "false").lower() == "true")
+
+    def __post_init__(self):
         if not self.dedalus_api_key:
             raise ValueError(
                 "DEDALUS_API_KEY environment variable is required. "
                 "Please add it to your .env file."
             )
 
-        # Optional: User can bring their own API keys
-        self.openai_api_key = os.getenv("OPENAI_API_KEY")
-        self.anthropic_api_key = os.getenv("ANTHROPIC_API_KEY")
-
-        self.financial_model = "openai/gpt-5"
-        self.market_model = "openai/gpt-5"
-        self.sentiment_model = "openai/gpt-5"
-        self.judge_models = ["openai/gpt-5", "anthropic/claude-sonnet-4-20250514"]
-
-        # MCP servers
-        self.brave_search_mcp = "windsor/brave-search-mcp"
-        self.exa_mcp = "joerup/exa-mcp"
-        self.sonar = "akakak/sonar"
-        self.yahoo_finance_mcp = "aq_humor/yahoo-finance-mcp"
-
-        # Logging
-        self.debug = os.getenv("DEBUG", "false").lower() == "true"
-
 
 config = Config()
@@ -1,9 +1,28 @@
 import asyncio
-from typing import Dict, Any, List
-from datetime import datetime
+import copy
+import functools
+import time
+from collections import Counter
+from typing import Dict, Any, List, Optional, Set
+from datetime import datetime, timezone
 
 from .agents import FinancialAgent, MarketAgent, SentimentAgent, JudgeAgent
+from .agents._dedalus import get_runner
+from .agents.parallel import with_timeout
+from .config import config
+from .utils.cache import AsyncTTLCache
+from .utils.http import close_shared_client
 from .utils.logger import logger
+from .utils.validation import validate_ticker
+
+# Ticker -> finished analysis; shared by every InvestSwarm, so concurrent runs
+# for one ticker (e.g. duplicates in a batch) share a single pipeline
+_CACHE = AsyncTTLCache(ttl=config.cache_ttl_seconds, maxsize=256)
+
+_BANNER = "=" * 80
+
+# Built on first use by analyze_stock() and reused for the life of the process
+_DEFAULT_SWARM: Optional["InvestSwarm"] = None
 
 
 class InvestSwarm:
@@ -14,69 +33,120 @@ class InvestSwarm:
         self.judge_agent = JudgeAgent()
 
     async def analyze_stock(self, stock_ticker: str, verbose: bool = True) -> Dict[str, Any]:
-        start_time = datetime.now()
-        stock_ticker = stock_ticker.upper()
+        stock_ticker = validate_ticker(stock_ticker)
+        loaded = False
+
+        async def load() -> Dict[str, Any]:
+            nonlocal loaded
+            loaded = True
+            results = await self._analyze(stock_ticker, verbose)
+            # Only successful verdicts are worth replaying
+            if results.get("status") != "success" or results["verdict"].get("status") != "success":
+                raise _Uncached(results)
+            return results
+
+        try:
+            results = await _CACHE.get_or_load(stock_ticker, load)
+        except _Uncached as e:
+            results = e.results
+        if verbose and not loaded:
+            logger.info("Using cached analysis for %s\n", stock_ticker)
+        # Progress lines are written in the background; let them land before
+        # the caller prints the results
+        logger.flush()
+        # Callers may mutate what they get back; the cached copy must not change
+        return copy.deepcopy(results)
+
+    async def analyze_stocks_batch(
+        self, tickers: List[str], max_concurrency: int = 8, verbose: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyze several tickers concurrently, at most `max_concurrency` at a time.
+        Results are in input order; a ticker that fails outright (e.g. an invalid
+        symbol) gets an error dict instead of aborting the batch.
+        """
+        sem = asyncio.Semaphore(max_concurrency)
+
+        async def analyze_one(ticker: str) -> Dict[str, Any]:
+            async with sem:
+                try:
+                    return await self.analyze_stock(ticker, verbose)
+                except Exception as e:
+                    logger.error("Error analyzing %s: %s", ticker, e)
+                    return {"status": "error", "error": str(e), "stock_ticker": ticker}
+
+        return await asyncio.gather(*[analyze_one(t) for t in tickers])
+
+    async def _analyze(self, stock_ticker: str, verbose: bool) -> Dict[str, Any]:
+        t0 = time.monotonic()
+        start_iso = datetime.now(timezone.utc).isoformat()
 
         if verbose:
-            logger.info(f"\n{'=' * 80}")
-            logger.info(f"InvestSwarm Analysis: {stock_ticker}")
-            logger.info(f"{'=' * 80}\n")
+            logger.info("\n%s\nInvestSwarm Analysis: %s\n%s\n", _BANNER, stock_ticker, _BANNER)
             logger.info("Starting parallel research with 3 specialized agents...\n")
 
+        # The judge's research-independent setup is done before phase 1
+        judge_prep = self.judge_agent.prepare(stock_ticker)
+
         # Phase 1: Run research agents in parallel
+        tasks = [
+            asyncio.ensure_future(self._run_agent(1, self.financial_agent, stock_ticker, verbose)),
+            asyncio.ensure_future(self._run_agent(2, self.market_agent, stock_ticker, verbose)),
+            asyncio.ensure_future(self._run_agent(3, self.sentiment_agent, stock_ticker, verbose)),
+        ]
         try:
-            research_results = await asyncio.gather(
-                self._run_financial_analysis(stock_ticker, verbose),
-                self._run_market_analysis(stock_ticker, verbose),
-                self._run_sentiment_analysis(stock_ticker, verbose),
-                return_exceptions=True,
-            )
+            # Serialize each agent's judge input as soon as it lands, overlapping
+            # that work with the agents still running
+            prepared: Dict[int, str] = {}
+
+            def prepare(index: int, task: "asyncio.Future[Dict[str, Any]]") -> None:
+                if not task.cancelled() and task.exception() is None:
+                    prepared[index] = self.judge_agent.prepare_input(task.result())
 
-            keys_in_order = [
-                ("financial", "Financial Analysis Agent"),
-                ("market", "Market & Product Analysis Agent"),
-                ("sentiment", "Sentiment Analysis Agent"),
-            ]
-
-            results_map: Dict[str, Dict[str, Any]] = {}
-            for (key, pretty), result in zip(keys_in_order, research_results):
-                if isinstance(result, Exception):
-                    logger.error(f"Error in {key} agent: {str(result)}")
-                    results_map[key] = {
-                        "agent": key,
-                        "agent_name": pretty,
-                        "analysis": f"Error: {str(result)}",
-                        "status": "error",
-                    }
-                else:
-                    results_map[key] = result
+            for index, task in enumerate(tasks):
+                task.add_done_callback(functools.partial(prepare, index))
+            skipped: Set["asyncio.Future[Dict[str, Any]]"] = set()
+            if config.early_consensus_confidence > 0:
+                skipped = await _wait_for_consensus(tasks, config.early_consensus_confidence, verbose)
+            fin, mkt, snt = await asyncio.gather(
+                _safe(tasks[0], "financial", "Financial Analysis Agent", skipped),
+                _safe(tasks[1], "market", "Market & Product Analysis Agent", skipped),
+                _safe(tasks[2], "sentiment", "Sentiment Analysis Agent", skipped),
+            )
 
         except Exception as e:
-            logger.error(f"Critical error during research phase: {str(e)}")
+            logger.error("Critical error during research phase: %s", e)
             return {
                 "status": "error",
                 "error": str(e),
                 "stock_ticker": stock_ticker,
             }
+        finally:
+            # Structured-concurrency cleanup: if this coroutine is cancelled or
+            # fails mid-phase, no agent is left running in the background
+            for task in tasks:
+                task.cancel()
 
         if verbose:
-            logger.info("\n" + "=" * 80)
-            logger.info("Research phase complete. Starting judge agent...")
-            logger.info("=" * 80 + "\n")
-
-        ordered_results: List[Dict[str, Any]] = [
-            results_map["financial"],
-            results_map["market"],
-            results_map["sentiment"],
+            logger.info("\n%s\nResearch phase complete. Starting judge agent...\n%s\n", _BANNER, _BANNER)
+
+        ordered_results = [fin, mkt, snt]
+
+        # Error and skipped shells were built after the fact, so prepare those now
+        prepared_inputs = [
+            prepared[i] if i in prepared else self.judge_agent.prepare_input(r)
+            for i, r in enumerate(ordered_results)
         ]
 
         try:
-            verdict_result = await self.judge_agent.judge(ordered_results, stock_ticker)
+            verdict_result = await self.judge_agent.judge(
+                ordered_results, stock_ticker, prepared_inputs, prep=judge_prep
+            )
             if verbose:
                 status = "✓" if verdict_result.get("status") == "success" else "✗"
-                logger.info(f"Judge Agent complete {status}\n")
+                logger.info("Judge Agent complete %s\n", status)
         except Exception as e:
-            logger.error(f"Error in judge agent: {str(e)}")
+            logger.error("Error in judge agent: %s", e)
             verdict_result = {
                 "agent": "judge",
                 "agent_name": "Judge & Verdict Agent",
@@ -85,56 +155,141 @@ class InvestSwarm:
                 "stock_ticker": stock_ticker,
             }
 
-        end_time = datetime.now()
-        duration = (end_time - start_time).total_seconds()
+        duration = time.monotonic() - t0
 
         if verbose:
-            logger.info("\n" + "=" * 80)
-            logger.info(f"Analysis complete in {duration:.2f} seconds")
-            logger.info("=" * 80 + "\n")
+            logger.info("\n%s\nAnalysis complete in %.2f seconds\n%s\n", _BANNER, duration, _BANNER)
 
         # Compile final output
         return {
             "status": "success",
             "stock_ticker": stock_ticker,
-            "timestamp": start_time.isoformat(),
+            "timestamp": start_iso,
             "duration_seconds": duration,
             "research": {
-                "financial": results_map["financial"],
-                "market": results_map["market"],
-                "sentiment": results_map["sentiment"],
+                "financial": fin,
+                "market": mkt,
+                "sentiment": snt,
             },
             "verdict": verdict_result,
         }
 
-    async def _run_financial_analysis(self, stock_ticker: str, verbose: bool) -> Dict[str, Any]:
-        if verbose:
-            logger.info("[1/3] Financial Analysis Agent starting...")
-        result = await self.financial_agent.analyze(stock_ticker)
-        if verbose:
-            status = "O" if result["status"] == "success" else "X"
-            logger.info(f"[1/3] Financial Analysis Agent complete {status}\n")
-        return result
+    async def aclose(self) -> None:
+        """Close the HTTP connection pool shared by all agents. It is reopened on next use."""
+        await close_shared_client()
 
-    async def _run_market_analysis(self, stock_ticker: str, verbose: bool) -> Dict[str, Any]:
+    async def _run_agent(self, idx: int, agent: Any, stock_ticker: str, verbose: bool) -> Dict[str, Any]:
         if verbose:
-            logger.info("[2/3] Market & Product Analysis Agent starting...")
-        result = await self.market_agent.analyze(stock_ticker)
+            logger.info("[%d/3] %s starting...", idx, agent.name)
+        result = await with_timeout(agent.analyze(stock_ticker), config.agent_timeout_s, agent.name)
         if verbose:
-            status = "O" if result["status"] == "success" else "X"
-            logger.info(f"[2/3] Market & Product Analysis Agent complete {status}\n")
+            logger.info("[%d/3] %s complete %s\n", idx, agent.name, "O" if result["status"] == "success" else "X")
         return result
 
-    async def _run_sentiment_analysis(self, stock_ticker: str, verbose: bool) -> Dict[str, Any]:
-        if verbose:
-            logger.info("[3/3] Sentiment Analysis Agent starting...")
-        result = await self.sentiment_agent.analyze(stock_ticker)
-        if verbose:
-            status = "O" if result["status"] == "success" else "X"
-            logger.info(f"[3/3] Sentiment Analysis Agent complete {status}\n")
-        return result
+
+async def _safe(
+    task: "asyncio.Future[Dict[str, Any]]",
+    key: str,
+    pretty: str,
+    skipped: Set["asyncio.Future[Dict[str, Any]]"],
+) -> Dict[str, Any]:
+    # Always yields a result dict, so one failing agent never fails the gather
+    try:
+        return await task
+    except asyncio.CancelledError:
+        if task not in skipped:
+            raise
+        return {
+            "agent": key,
+            "agent_name": pretty,
+            "analysis": "Skipped: the other agents already agreed with high confidence",
+            "status": "skipped",
+        }
+    except Exception as e:
+        logger.error("Error in %s agent: %s", key, e)
+        return {
+            "agent": key,
+            "agent_name": pretty,
+            "analysis": f"Error: {str(e)}",
+            "status": "error",
+        }
+
+
+def _strong_stance(task: "asyncio.Future[Dict[str, Any]]", min_confidence: int) -> Optional[str]:
+    if task.cancelled() or task.exception() is not None:
+        return None
+    result = task.result()
+    analysis = result.get("analysis")
+    if result.get("status") != "success" or not isinstance(analysis, dict):
+        return None
+    try:
+        confident = float(analysis.get("confidence", 0)) >= min_confidence
+    except (TypeError, ValueError):
+        return None
+    return analysis.get("overall_stance") if confident else None
+
+
+async def _wait_for_consensus(
+    tasks: List["asyncio.Future[Dict[str, Any]]"], min_confidence: int, verbose: bool
+) -> Set["asyncio.Future[Dict[str, Any]]"]:
+    # As agents finish, cancel whatever is still running once two of them
+    # report the same stance with high confidence; returns the cancelled tasks
+    pending = set(tasks)
+    while pending:
+        _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        stances = Counter(_strong_stance(t, min_confidence) for t in tasks if t.done())
+        stances.pop(None, None)
+        if pending and any(n >= 2 for n in stances.values()):
+            if verbose:
+                logger.info("Early consensus reached; skipping the remaining research agent\n")
+            for t in pending:
+                t.cancel()
+            return pending
+    return set()
+
+
+class _Uncached(Exception):
+    # Carries a finished but unsuccessful analysis out of the cache loader, so
+    # it is handed to the callers waiting on it without being stored
+    def __init__(self, results: Dict[str, Any]):
+        super().__init__("analysis did not succeed")
+        self.results = results
+
+
+def _default_swarm() -> InvestSwarm:
+    # No lock needed: construction is synchronous, so there is no await
+    # between the check and the assignment for another task to slip into
+    global _DEFAULT_SWARM
+    if _DEFAULT_SWARM is None:
+        _DEFAULT_SWARM = InvestSwarm()
+    return _DEFAULT_SWARM
+
+
+async def init_swarm() -> InvestSwarm:
+    """
+    Build the shared swarm and its Dedalus client and connection pool up front,
+    so the first analyze_stock() doesn't pay for it. Optional; safe to call twice.
+    """
+    swarm = _default_swarm()
+    get_runner()
+    return swarm
+
+
+async def shutdown_swarm() -> None:
+    """Drop the shared swarm and close its connection pool."""
+    global _DEFAULT_SWARM
+    swarm, _DEFAULT_SWARM = _DEFAULT_SWARM, None
+    if swarm is not None:
+        await swarm.aclose()
+    else:
+        await close_shared_client()
 
 
 async def analyze_stock(stock_ticker: str, verbose: bool = True) -> Dict[str, Any]:
-    swarm = InvestSwarm()
-    return await swarm.analyze_stock(stock_ticker, verbose)
+    return await _default_swarm().analyze_stock(stock_ticker, verbose)
+
+
+async def analyze_stocks_batch(
+    tickers: List[str], max_concurrency: int = 8, verbose: bool = False
+) -> List[Dict[str, Any]]:
+    return await _default_swarm().analyze_stocks_batch(tickers, max_concurrency, verbose)
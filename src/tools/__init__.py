@@ -2,8 +2,10 @@
 
 from .financial_tools import (
     calculate_financial_ratios,
+    calculate_financial_ratios_batch,
     calculate_valuation_metrics,
     analyze_growth_trends,
+    analyze_growth_trends_batch,
 )
 from .sentiment_tools import (
     score_sentiment,
@@ -11,15 +13,19 @@ from .sentiment_tools import (
 )
 from .code_execution import (
     execute_python_code,
+    execute_python_code_async,
     calculate_metrics,
 )
 
 __all__ = [
     "calculate_financial_ratios",
+    "calculate_financial_ratios_batch",
     "calculate_valuation_metrics",
     "analyze_growth_trends",
+    "analyze_growth_trends_batch",
     "score_sentiment",
     "analyze_news_sentiment",
     "execute_python_code",
+    "execute_python_code_async",
     "calculate_metrics",
 ]
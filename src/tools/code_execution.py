@@ -1,83 +1,151 @@
 """execution tool"""
 
-import sys
+import asyncio
+import builtins
+import functools
 from io import StringIO
-from typing import Dict, Any
+from types import CodeType, MappingProxyType
+from typing import Dict, Any, Optional
+
+from ..utils.process_pool import get_process_pool
+
+
+@functools.lru_cache(maxsize=256)
+def _compile(code: str) -> CodeType:
+    # Agents tend to resend the same snippets; skip re-parsing them
+    return compile(code, "<agent code>", "exec")
 
 
 def execute_python_code(code: str) -> str:
+    """
+    Run a Python snippet and return what it printed, its `result` variable,
+    or the variables it defined. Common builtins are available; imports are
+    limited to math, cmath, statistics, decimal, fractions, random, datetime,
+    calendar, json, re, string, collections, itertools, functools, operator,
+    heapq and bisect.
+    """
     try:
-        namespace = {
-            "__builtins__": __builtins__,
-            "abs": abs,
-            "round": round,
-            "min": min,
-            "max": max,
-            "sum": sum,
-            "len": len,
-            "range": range,
-            "enumerate": enumerate,
-            "zip": zip,
-            "sorted": sorted,
-            "list": list,
-            "dict": dict,
-            "set": set,
-            "tuple": tuple,
-            "str": str,
-            "int": int,
-            "float": float,
-            "bool": bool,
-        }
-
-        # Capture stdout
-        old_stdout = sys.stdout
-        sys.stdout = captured_output = StringIO()
-
-        try:
-            exec(code, namespace)
-            output = captured_output.getvalue()
-            if 'result' in namespace:
-                if output:
-                    return f"{output}\nResult: {namespace['result']}"
-                return str(namespace['result'])
-
-            if output:
-                return output
-            results = {
-                k: v for k, v in namespace.items()
-                if not k.startswith('_') and k not in {
-                    "abs", "round", "min", "max", "sum", "len", "range",
-                    "enumerate", "zip", "sorted", "list", "dict", "set",
-                    "tuple", "str", "int", "float", "bool"
-                }
-            }
-
-            if results:
-                return str(results)
-
-            return "Code executed successfully (no output)"
-
-        finally:
-            sys.stdout = old_stdout
-
+        return _execute(_compile(code))
     except Exception as e:
         return f"Error executing code: {str(e)}"
 
 
-def calculate_metrics(data: Dict[str, Any]) -> str:
-    code = f"""
-# Calculate metrics from provided data
-data = {data}
+async def execute_python_code_async(code: str, use_processes: bool = False) -> str:
+    """
+    execute_python_code() off the event loop thread. With `use_processes`, it
+    runs in a shared process pool instead, so CPU-heavy snippets get a core
+    of their own rather than contending for the GIL.
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_process_pool() if use_processes else None
+    return await loop.run_in_executor(executor, execute_python_code, code)
+
+
+# Pure standard-library modules snippets may import (submodules included);
+# anything else raises ImportError
+_ALLOWED_MODULES = frozenset({
+    "math", "cmath", "statistics", "decimal", "fractions", "random",
+    "datetime", "calendar", "json", "re", "string",
+    "collections", "itertools", "functools", "operator", "heapq", "bisect",
+})
+
+
+def _make_import():
+    # Built per call, so snippets never get a reference to a module-level helper
+    def _import(name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name.partition(".")[0] not in _ALLOWED_MODULES:
+            raise ImportError(f"import of '{name}' is not allowed")
+        return __import__(name, globals, locals, fromlist, level)
+    return _import
+
+
+# The only builtins a snippet can see by name: the ordinary pure functions,
+# types and exceptions. Copied per call, never mutated. This keeps ordinary
+# snippets away from open/exec/eval/input, but it is not a sandbox:
+# introspection (e.g. any builtin's __self__) still reaches the rest
+_SAFE_BUILTINS = MappingProxyType({
+    name: getattr(builtins, name)
+    for name in (
+        "__build_class__",
+        # functions
+        "abs", "all", "any", "ascii", "bin", "callable", "chr", "divmod",
+        "enumerate", "filter", "format", "getattr", "hasattr", "hash", "hex",
+        "id", "isinstance", "issubclass", "iter", "len", "map", "max", "min",
+        "next", "oct", "ord", "pow", "range", "repr", "reversed", "round",
+        "setattr", "sorted", "sum", "zip",
+        # types
+        "bool", "bytearray", "bytes", "classmethod", "complex", "dict",
+        "float", "frozenset", "int", "list", "object", "property", "set",
+        "slice", "staticmethod", "str", "super", "tuple", "type",
+        # constants
+        "Ellipsis", "NotImplemented",
+        # exceptions
+        "ArithmeticError", "AssertionError", "AttributeError", "BaseException",
+        "Exception", "FloatingPointError", "IndexError", "KeyError",
+        "LookupError", "NameError", "NotImplementedError", "OverflowError",
+        "RuntimeError", "StopIteration", "TypeError", "UnboundLocalError",
+        "ValueError", "ZeroDivisionError",
+    )
+})
+# Hidden from the namespace dump
+_BASE_KEYS = frozenset({"__builtins__", "__name__", "print"})
+
+
+def _execute(compiled: CodeType, bindings: Optional[Dict[str, Any]] = None) -> str:
+    snippet_builtins = dict(_SAFE_BUILTINS)
+    snippet_builtins["__import__"] = _make_import()
+    # class bodies look up __name__ for their __module__
+    namespace: Dict[str, Any] = {"__builtins__": snippet_builtins, "__name__": "__agent__"}
+    if bindings:
+        namespace.update(bindings)
+
+    # Capture output through a print bound to this call's buffer rather than
+    # swapping the process-wide sys.stdout, so concurrent calls (threads or
+    # interleaved tasks) can't write into each other's output or the console
+    captured_output = StringIO()
 
-# Example calculations
+    def _print(*args, sep=" ", end="\n", file=None, flush=False):
+        print(*args, sep=sep, end=end, file=captured_output if file is None else file)
+
+    namespace["print"] = _print
+
+    exec(compiled, namespace)
+    output = captured_output.getvalue()
+    if 'result' in namespace:
+        if output:
+            return f"{output}\nResult: {namespace['result']}"
+        return str(namespace['result'])
+
+    if output:
+        return output
+    results = {
+        k: v for k, v in namespace.items()
+        if k not in _BASE_KEYS and not k.startswith('_')
+    }
+
+    if results:
+        return str(results)
+
+    return "Code executed successfully (no output)"
+
+
+# Compiled once; each call binds its own `data`
+_METRICS_CODE = _compile("""
+# Calculate metrics from provided data
 if 'revenue' in data and 'net_income' in data:
     profit_margin = (data['net_income'] / data['revenue']) * 100
-    print(f"Profit Margin: {{profit_margin:.2f}}%")
+    print(f"Profit Margin: {profit_margin:.2f}%")
 
 if 'price' in data and 'eps' in data and data['eps'] > 0:
     pe_ratio = data['price'] / data['eps']
-    print(f"P/E Ratio: {{pe_ratio:.2f}}")
+    print(f"P/E Ratio: {pe_ratio:.2f}")
 
 result = "Metrics calculated successfully"
-"""
-    return execute_python_code(code)
+""")
+
+
+def calculate_metrics(data: Dict[str, Any]) -> str:
+    try:
+        return _execute(_METRICS_CODE, {"data": data})
+    except Exception as e:
+        return f"Error executing code: {str(e)}"
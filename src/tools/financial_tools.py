@@ -1,6 +1,12 @@
 """Financial analysis tools."""
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Sequence
+
+try:
+    # Optional: pip install numpy (vectorizes the *_batch helpers)
+    import numpy as np
+except ImportError:
+    np = None
 
 
 def calculate_financial_ratios(
@@ -55,6 +61,50 @@ def calculate_financial_ratios(
         return {"error": f"Error calculating ratios: {str(e)}"}
 
 
+def calculate_financial_ratios_batch(
+    revenue: Sequence[float],
+    net_income: Sequence[float],
+    total_assets: Sequence[float],
+    total_debt: Sequence[float],
+    equity: Sequence[float],
+    shares_outstanding: Sequence[float],
+) -> Dict[str, Any]:
+    """
+    calculate_financial_ratios() across many tickers, one array element per
+    ticker. Returns one array per ratio (lists when numpy is unavailable); the
+    zero-guards are applied with np.where instead of per-ticker branches.
+    """
+    if np is None:
+        rows = [
+            calculate_financial_ratios(*values)
+            for values in zip(revenue, net_income, total_assets, total_debt, equity, shares_outstanding)
+        ]
+        keys = ("profit_margin", "roe", "roa", "debt_to_equity", "debt_ratio", "eps", "book_value_per_share")
+        return {k: [row.get(k) for row in rows] for k in keys}
+
+    rev = np.asarray(revenue, dtype=np.float64)
+    ni = np.asarray(net_income, dtype=np.float64)
+    assets = np.asarray(total_assets, dtype=np.float64)
+    debt = np.asarray(total_debt, dtype=np.float64)
+    eq = np.asarray(equity, dtype=np.float64)
+    shares = np.asarray(shares_outstanding, dtype=np.float64)
+
+    def ratio(num, den, fallback=0.0):
+        # Divide by 1 where the guard fails so no warnings or NaNs are produced
+        ok = den > 0
+        return np.where(ok, num / np.where(ok, den, 1.0), fallback)
+
+    return {
+        "profit_margin": ratio(ni, rev) * 100,
+        "roe": ratio(ni, eq) * 100,  # Return on Equity
+        "roa": ratio(ni, assets) * 100,  # Return on Assets
+        "debt_to_equity": ratio(debt, eq, np.where(debt > 0, np.inf, 0.0)),
+        "debt_ratio": ratio(debt, assets),
+        "eps": ratio(ni, shares),
+        "book_value_per_share": ratio(eq, shares),
+    }
+
+
 def calculate_valuation_metrics(
     market_cap: float,
     revenue: float,
@@ -137,3 +187,60 @@ def analyze_growth_trends(
 
     except Exception as e:
         return {"error": f"Error analyzing growth trends: {str(e)}"}
+
+
+def analyze_growth_trends_batch(
+    revenue_histories: Sequence[Sequence[float]],
+    net_income_histories: Sequence[Sequence[float]],
+    periods: int = 3
+) -> List[Dict[str, Any]]:
+    """
+    analyze_growth_trends() for many tickers at once, one history per row.
+    With numpy and equal-length histories the batch is computed in a single
+    vectorized pass; otherwise each ticker goes through the scalar function.
+    """
+    def scalar() -> List[Dict[str, Any]]:
+        return [
+            analyze_growth_trends(list(rev), list(inc), periods)
+            for rev, inc in zip(revenue_histories, net_income_histories)
+        ]
+
+    if np is None or periods < 1:
+        return scalar()
+    try:
+        rev = np.asarray(revenue_histories, dtype=np.float64)
+        inc = np.asarray(net_income_histories, dtype=np.float64)
+    except ValueError:  # ragged histories
+        return scalar()
+    if rev.ndim != 2 or inc.ndim != 2 or len(rev) != len(inc):
+        return scalar()
+
+    trends: List[Dict[str, Any]] = [{} for _ in range(len(rev))]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if rev.shape[1] >= 2:
+            recent = rev[:, -1]
+            old = rev[:, -min(periods + 1, rev.shape[1])]
+            growth = np.where(old > 0, (recent - old) / old * 100, 0.0).tolist()
+            cagr = None
+            if rev.shape[1] >= periods + 1:
+                cagr = ((np.power(recent / old, 1 / periods) - 1) * 100).tolist()
+            for i, row in enumerate(trends):
+                row["revenue_growth_rate"] = growth[i]
+                if cagr is not None:
+                    row["revenue_cagr"] = cagr[i]
+
+        if inc.shape[1] >= 2:
+            recent = inc[:, -1]
+            old = inc[:, -min(periods + 1, inc.shape[1])]
+            growth = np.where(old > 0, (recent - old) / old * 100, 0.0).tolist()
+            for i, row in enumerate(trends):
+                row["income_growth_rate"] = growth[i]
+
+    # The scalar CAGR raises on a zero base and goes complex when recent/old is
+    # negative, where np.power gives nan; defer to it for those rows so both
+    # paths return the same thing
+    if rev.shape[1] >= max(2, periods + 1):
+        base = rev[:, -min(periods + 1, rev.shape[1])]
+        for i in np.flatnonzero((base <= 0) | (rev[:, -1] < 0)).tolist():
+            trends[i] = analyze_growth_trends(list(revenue_histories[i]), list(net_income_histories[i]), periods)
+    return trends
@@ -1,7 +1,124 @@
 """Sentiment analysis tools"""
 
+import functools
+import os
 import re
-from typing import Dict, Any
+from bisect import bisect_right
+from collections import Counter
+from typing import Dict, Any, Iterator, List, NamedTuple, Tuple
+
+from ..utils.process_pool import get_process_pool
+
+try:
+    # Optional: pip install pyahocorasick
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Positive keywords
+_POSITIVE_KEYWORDS = (
+    "bullish", "buy", "strong", "growth", "profit", "gain", "upgrade",
+    "outperform", "positive", "beat", "exceeded", "success", "innovation",
+    "leader", "advantage", "opportunity", "momentum", "rally", "surge",
+    "breakthrough", "excellent", "impressive", "confident", "optimistic"
+)
+
+# Negative keywords ("decline" is listed twice, so it counts double)
+_NEGATIVE_KEYWORDS = (
+    "bearish", "sell", "weak", "decline", "loss", "downgrade", "miss",
+    "underperform", "negative", "failed", "concern", "risk", "threat",
+    "challenge", "competition", "decline", "drop", "fall", "plunge",
+    "disappointing", "worry", "caution", "pessimistic", "struggle"
+)
+
+# keyword -> (positive weight, negative weight)
+_POS_COUNTS, _NEG_COUNTS = Counter(_POSITIVE_KEYWORDS), Counter(_NEGATIVE_KEYWORDS)
+_KEYWORD_WEIGHTS: Dict[str, Tuple[int, int]] = {
+    word: (_POS_COUNTS[word], _NEG_COUNTS[word]) for word in set(_POS_COUNTS) | set(_NEG_COUNTS)
+}
+
+# Fallback scanner: every keyword in one case-insensitive alternation, longest
+# first, so the text is scanned as-is rather than lowercased into a copy. Each
+# keyword is its own named group, so match.lastgroup identifies it whatever its case
+_KEYWORD_RE = re.compile(
+    r'\b(?:'
+    + '|'.join(f'(?P<{word}>{re.escape(word)})' for word in sorted(_KEYWORD_WEIGHTS, key=len, reverse=True))
+    + r')\b',
+    re.IGNORECASE,
+)
+
+
+def _build_automaton():
+    automaton = ahocorasick.Automaton()
+    for word, (pos, neg) in _KEYWORD_WEIGHTS.items():
+        automaton.add_word(word, (len(word), pos, neg))
+    automaton.make_automaton()
+    return automaton
+
+
+_AUTOMATON = _build_automaton() if ahocorasick is not None else None
+
+def _fold(text: str) -> str:
+    # The automaton matches case-sensitively against the lowercase keywords;
+    # the regex ignores case itself, so the text needn't be copied for it
+    return text.lower() if _AUTOMATON is not None else text
+
+
+def _is_word_char(ch: str) -> bool:
+    # Same notion of a word character as the \b in the regex path
+    return ch.isalnum() or ch == "_"
+
+
+def _iter_hits(text: str) -> Iterator[Tuple[int, int, int]]:
+    # (start offset, positive weight, negative weight) of each whole-word keyword
+    # in _fold(text)
+    if _AUTOMATON is None:
+        for match in _KEYWORD_RE.finditer(text):
+            pos, neg = _KEYWORD_WEIGHTS[match.lastgroup]
+            yield match.start(), pos, neg
+        return
+
+    # Single pass over the text; hits inside longer words are rejected
+    last = len(text) - 1
+    for end, (length, pos, neg) in _AUTOMATON.iter(text):
+        start = end - length + 1
+        if start > 0 and _is_word_char(text[start - 1]):
+            continue
+        if end < last and _is_word_char(text[end + 1]):
+            continue
+        yield start, pos, neg
+
+
+class SentimentResult(NamedTuple):
+    score: float
+    classification: str
+    confidence: float
+    positive_mentions: int
+    negative_mentions: int
+
+
+# Indexed by (score > 0.2) + (score >= -0.2)
+_CLASSES = ("bearish", "neutral", "bullish")
+
+
+def _classify(score: float) -> str:
+    return _CLASSES[(score > 0.2) + (score >= -0.2)]
+
+
+def _score_counts(positive_count: int, negative_count: int) -> SentimentResult:
+    total_sentiment_words = positive_count + negative_count
+
+    # Calculate score
+    if total_sentiment_words == 0:
+        score = 0.0
+        confidence = 0.0
+    else:
+        score = (positive_count - negative_count) / total_sentiment_words
+        confidence = min(total_sentiment_words / 10, 1.0) 
+
+    return SentimentResult(
+        round(score, 2), _classify(score), round(confidence, 2), positive_count, negative_count
+    )
 
 
 def score_sentiment(text: str) -> Dict[str, Any]:
@@ -13,60 +130,41 @@ def score_sentiment(text: str) -> Dict[str, Any]:
             "confidence": 0.0
         }
 
-    text_lower = text.lower()
-
-    # Positive keywords
-    positive_keywords = [
-        "bullish", "buy", "strong", "growth", "profit", "gain", "upgrade",
-        "outperform", "positive", "beat", "exceeded", "success", "innovation",
-        "leader", "advantage", "opportunity", "momentum", "rally", "surge",
-        "breakthrough", "excellent", "impressive", "confident", "optimistic"
-    ]
-
-    # Negative keywords
-    negative_keywords = [
-        "bearish", "sell", "weak", "decline", "loss", "downgrade", "miss",
-        "underperform", "negative", "failed", "concern", "risk", "threat",
-        "challenge", "competition", "decline", "drop", "fall", "plunge",
-        "disappointing", "worry", "caution", "pessimistic", "struggle"
-    ]
-
-    # Count occurrences
-    positive_count = sum(
-        len(re.findall(r'\b' + re.escape(word) + r'\b', text_lower))
-        for word in positive_keywords
-    )
-    negative_count = sum(
-        len(re.findall(r'\b' + re.escape(word) + r'\b', text_lower))
-        for word in negative_keywords
-    )
+    # Plain dict at the tool boundary, where results are serialized for the model
+    return _score_counts(*_keyword_counts(text))._asdict()
 
-    total_sentiment_words = positive_count + negative_count
 
-    # Calculate score
-    if total_sentiment_words == 0:
-        score = 0.0
-        confidence = 0.0
-    else:
-        score = (positive_count - negative_count) / total_sentiment_words
-        confidence = min(total_sentiment_words / 10, 1.0) 
+# Headlines recur across feeds and runs; only the immutable counts are cached,
+# so every caller still gets a fresh dict
+@functools.lru_cache(maxsize=4096)
+def _keyword_counts(text: str) -> Tuple[int, int]:
+    positive_count = negative_count = 0
+    for _, pos, neg in _iter_hits(_fold(text)):
+        positive_count += pos
+        negative_count += neg
+    return positive_count, negative_count
 
-    # Classify
-    if score > 0.2:
-        classification = "bullish"
-    elif score < -0.2:
-        classification = "bearish"
-    else:
-        classification = "neutral"
 
-    return {
-        "score": round(score, 2),
-        "classification": classification,
-        "confidence": round(confidence, 2),
-        "positive_mentions": positive_count,
-        "negative_mentions": negative_count
-    }
+def _article_counts(texts: List[str]) -> Tuple[List[int], List[int]]:
+    # Scan the articles as one newline-joined text (the newline keeps words from
+    # joining across articles) and attribute each hit by its offset
+    starts = []
+    offset = 0
+    for text in texts:
+        starts.append(offset)
+        offset += len(text) + 1
+
+    positive_counts = [0] * len(texts)
+    negative_counts = [0] * len(texts)
+    for start, pos, neg in _iter_hits("\n".join(texts)):
+        index = bisect_right(starts, start) - 1
+        positive_counts[index] += pos
+        negative_counts[index] += neg
+    return positive_counts, negative_counts
+
 
+# Below this many characters the scan is faster than shipping text to workers
+_PARALLEL_MIN_CHARS = 2_000_000
 
 def analyze_news_sentiment(articles: list) -> Dict[str, Any]:
     if not articles:
@@ -76,29 +174,37 @@ def analyze_news_sentiment(articles: list) -> Dict[str, Any]:
             "article_count": 0
         }
 
-    sentiments = [score_sentiment(article) for article in articles]
-
-    avg_score = sum(s["score"] for s in sentiments) / len(sentiments)
-    avg_confidence = sum(s["confidence"] for s in sentiments) / len(sentiments)
-
-    # Count classifications
-    bullish = sum(1 for s in sentiments if s["classification"] == "bullish")
-    bearish = sum(1 for s in sentiments if s["classification"] == "bearish")
-    neutral = sum(1 for s in sentiments if s["classification"] == "neutral")
-
-    if avg_score > 0.2:
-        overall_classification = "bullish"
-    elif avg_score < -0.2:
-        overall_classification = "bearish"
+    texts = [_fold(article) if article else "" for article in articles]
+    total_chars = sum(len(text) for text in texts)
+    workers = os.cpu_count() or 1
+    if workers > 1 and len(texts) > 1 and total_chars >= _PARALLEL_MIN_CHARS:
+        # Large batches: scan contiguous slices in worker processes
+        size = -(-len(texts) // workers)
+        slices = [texts[i:i + size] for i in range(0, len(texts), size)]
+        counts = list(get_process_pool().map(_article_counts, slices))
     else:
-        overall_classification = "neutral"
+        counts = [_article_counts(texts)]
+    positive_counts = [c for pos, _ in counts for c in pos]
+    negative_counts = [c for _, neg in counts for c in neg]
+
+    # Sum scores and count classifications in one pass
+    score_total = confidence_total = 0.0
+    classifications = {"bullish": 0, "bearish": 0, "neutral": 0}
+    for p, n in zip(positive_counts, negative_counts):
+        sentiment = _score_counts(p, n)
+        score_total += sentiment.score
+        confidence_total += sentiment.confidence
+        classifications[sentiment.classification] += 1
+
+    avg_score = score_total / len(articles)
+    avg_confidence = confidence_total / len(articles)
 
     return {
         "overall_score": round(avg_score, 2),
-        "overall_classification": overall_classification,
+        "overall_classification": _classify(avg_score),
         "confidence": round(avg_confidence, 2),
         "article_count": len(articles),
-        "bullish_articles": bullish,
-        "bearish_articles": bearish,
-        "neutral_articles": neutral
+        "bullish_articles": classifications["bullish"],
+        "bearish_articles": classifications["bearish"],
+        "neutral_articles": classifications["neutral"]
     }
@@ -1,5 +1,6 @@
 """Utility modules for InvestSwarm."""
 
 from .logger import logger
+from .validation import validate_ticker
 
-__all__ = ["logger"]
+__all__ = ["logger", "validate_ticker"]
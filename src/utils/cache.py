@@ -0,0 +1,113 @@
+"""Async TTL cache with single-flight loading."""
+
+import asyncio
+import hashlib
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+_MISSING = object()
+
+# Runtime switch shared by every AsyncTTLCache; see set_caching()
+_enabled = True
+
+
+def set_caching(enabled: bool) -> None:
+    """
+    Turn every AsyncTTLCache on or off for the rest of the process. While off,
+    loads always run and nothing is stored; turning it off also drops the
+    entries already stored.
+    """
+    global _enabled
+    _enabled = enabled
+    if not enabled:
+        for cache in list(_CACHES):
+            cache.clear()
+
+
+def hash_key(*parts: str) -> str:
+    # Content-addressed key; parts are normalized so whitespace/case variants collide
+    normalized = "\x00".join(p.strip().lower() for p in parts)
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+class AsyncTTLCache:
+
+    def __init__(self, ttl: float, maxsize: int = 512):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        _CACHES.add(self)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if not _enabled:
+            return default
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        stored_at, value = entry
+        if time.monotonic() - stored_at >= self.ttl:
+            del self._entries[key]
+            return default
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        if self.ttl <= 0 or not _enabled:
+            return
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached value for `key`, or await `loader()` and cache it.
+        Concurrent callers for the same key share one in-flight load.
+        Failed loads are not cached.
+        """
+        if self.ttl <= 0 or not _enabled:
+            return await loader()
+
+        while True:
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            try:
+                # shield so one waiter being cancelled doesn't cancel the shared load
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # the loading caller was cancelled; take over the load ourselves
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        else:
+            future.set_result(value)
+            self.set(key, value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+
+# Every cache built so far, for set_caching()
+_CACHES: "weakref.WeakSet[AsyncTTLCache]" = weakref.WeakSet()
@@ -0,0 +1,48 @@
+"""Shared HTTP connection pool for outbound API calls."""
+
+import asyncio
+import importlib.util
+from typing import Optional
+
+import httpx
+
+# HTTP/2 multiplexes the concurrent agent calls over a few connections instead
+# of one TLS handshake per pooled HTTP/1.1 connection; httpx needs `h2` for it
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+_LIMITS = httpx.Limits(max_keepalive_connections=64, max_connections=128, keepalive_expiry=60)
+# Generous read timeout: a single agent call includes MCP tool round-trips
+_TIMEOUT = httpx.Timeout(600.0, connect=10.0)
+
+_client: Optional[httpx.AsyncClient] = None
+# The loop the pool's connections belong to; they can't be used from another
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    # Rebuilt if closed, or if a later asyncio.run() is now the running loop
+    global _client, _client_loop
+    loop = _running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            http2=_HTTP2, limits=_LIMITS, timeout=_TIMEOUT, follow_redirects=True
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_shared_client() -> None:
+    global _client, _client_loop
+    client, owner = _client, _client_loop
+    _client = _client_loop = None
+    # A pool left over from an earlier loop can't be closed from this one;
+    # its connections went away with that loop
+    if client is not None and owner is _running_loop():
+        await client.aclose()
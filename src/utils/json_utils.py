@@ -1,65 +1,227 @@
 # src/utils/json_utils.py
 import json, re
-from typing import Any
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # fall back to stdlib json
+    orjson = None
 
 SMART_QUOTES = {
     "“": '"', "”": '"', "„": '"', "‟": '"',
     "’": "'", "‘": "'", "‚": "'", "‛": "'",
 }
+_SMART_TABLE = str.maketrans(SMART_QUOTES)
 
 def _normalize_quotes(s: str) -> str:
-    for k, v in SMART_QUOTES.items():
-        s = s.replace(k, v)
-    return s
+    return s.translate(_SMART_TABLE)
 
-def _strip_code_fences(s: str) -> str:
-    # removes ```json ... ``` or ``` ... ```
+def _preprocess(s: str) -> str:
+    # Strips whitespace and ```json ... ``` or ``` ... ``` fences by slicing,
+    # then normalizes quotes in one translate over what's left
     s = s.strip()
     if s.startswith("```"):
-        # remove first fence
-        s = re.sub(r"^```(?:json)?\s*", "", s, flags=re.IGNORECASE)
-        # remove last fence
-        s = re.sub(r"\s*```$", "", s)
-    return s.strip()
+        s = s[3:]
+        if s[:4].lower() == "json":
+            s = s[4:]
+        s = s.lstrip()
+        if s.endswith("```"):
+            s = s[:-3].rstrip()
+    return s.translate(_SMART_TABLE)
+
+# Outside strings only braces and quotes matter; the runs between them are
+# skipped by the regex engine rather than stepped through in Python
+_STRUCTURAL_RE = re.compile(r'[{}"]')
+
+def _string_end(s: str, i: int) -> int:
+    # Index of the quote closing the string whose body starts at i. Jumps from
+    # quote to quote with str.find; a quote preceded by an odd run of
+    # backslashes is escaped
+    while True:
+        q = s.find('"', i)
+        if q < 0:
+            return -1
+        k = q
+        while s[k - 1] == "\\":
+            k -= 1
+        if (q - k) % 2 == 0:
+            return q
+        i = q + 1
 
 def _first_balanced_json_object(s: str) -> str:
     start = s.find("{")
     if start < 0:
         raise ValueError("No '{' found in text")
     depth = 0
-    in_str = False
-    esc = False
-    for i in range(start, len(s)):
+    pos = start
+    while True:
+        m = _STRUCTURAL_RE.search(s, pos)
+        if m is None:
+            break
+        i = m.start()
         c = s[i]
-        if in_str:
-            if esc:
-                esc = False
-            elif c == "\\":
-                esc = True
-            elif c == '"':
-                in_str = False
+        if c == '"':
+            pos = _string_end(s, i + 1) + 1
+            if pos == 0:
+                break
+        elif c == "{":
+            depth += 1
+            pos = i + 1
         else:
-            if c == '"':
-                in_str = True
-            elif c == "{":
-                depth += 1
-            elif c == "}":
-                depth -= 1
-                if depth == 0:
-                    return s[start:i+1]
+            depth -= 1
+            if depth == 0:
+                return s[start:i+1]
+            pos = i + 1
     raise ValueError("Unbalanced JSON braces")
 
+# A run this long may be an integer wider than 64 bits, which orjson would
+# silently turn into a float; such payloads go to stdlib json instead
+_LONG_DIGITS_RE = re.compile(r"\d{19}")
+
+def loads(s: str) -> Any:
+    if orjson is not None and not _LONG_DIGITS_RE.search(s):
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN/Infinity literals, which stdlib json accepts
+    return json.loads(s)
+
 def parse_model_json(text: str) -> Any:
-    s = _normalize_quotes(_strip_code_fences(text))
+    s = _preprocess(text)
+    if s.startswith("{"):
+        # Common case: the payload is exactly one object, so the brace scan
+        # would return all of it anyway
+        try:
+            return loads(s)
+        except ValueError:
+            pass
     try:
         chunk = _first_balanced_json_object(s)
-        return json.loads(chunk)
+        return loads(chunk)
     except Exception:
         try:
             # Optional: pip install json-repair
             from json_repair import repair_json
             repaired = repair_json(s)
-            return json.loads(repaired)
+            return loads(repaired)
         except Exception as e:
             # surface the raw text for debugging upstream
             raise ValueError(f"Failed to parse model JSON. Raw:\n{s[:5000]}") from e
+
+def dumps_bytes(obj: Any, indent: bool = False) -> bytes:
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, option=option)
+        except TypeError:
+            pass  # e.g. integers wider than 64 bits; let stdlib handle them
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    return dumps_bytes(obj, indent).decode("utf-8")
+
+class IncrementalJsonParser:
+    """
+    Accumulates a streamed JSON object as text and can produce a best-effort
+    value at any point. Scanning is O(n) overall: each character is looked at
+    once (unless a '{' in leading prose is briefly taken for the object and
+    the scan resumes after it), and only the last position where the document
+    could be cut and closed (after a complete member or element) is remembered.
+    """
+
+    _CLOSERS = {"{": "}", "[": "]"}
+
+    def __init__(self) -> None:
+        self._parts = []
+        self._size = 0
+        self.complete = False
+        self._reset()
+
+    def _reset(self) -> None:
+        self._stack = []
+        self._started = False
+        self._start = 0
+        self._expect_key = False
+        self._in_str = False
+        self._esc = False
+        self._cut = 0
+        self._cut_closers = ""
+
+    def feed(self, text: str) -> None:
+        offset = self._size
+        self._parts.append(text)
+        self._size += len(text)
+        # A candidate that turns out not to be the object is dropped: a '{' in
+        # prose is skipped, a closed object that won't decode is stepped over
+        while not self.complete:
+            restart = self._scan(text, offset)
+            if restart is None:
+                return
+            self._reset()
+            text, offset = self.text[restart:], restart
+
+    def _scan(self, text: str, offset: int) -> Optional[int]:
+        stack = self._stack
+        for i, c in enumerate(text):
+            if self._expect_key:
+                # An object opens with a key or closes at once; anything else
+                # means this '{' was prose
+                if c in " \t\r\n":
+                    continue
+                if c not in '"}':
+                    return self._start + 1
+                self._expect_key = False
+            if not self._started:
+                if c != "{":
+                    continue  # skip code fences or prose before the object
+                self._started = True
+                self._expect_key = True
+                self._start = offset + i
+            if self._in_str:
+                if self._esc:
+                    self._esc = False
+                elif c == "\\":
+                    self._esc = True
+                elif c == '"':
+                    self._in_str = False
+            elif c == '"':
+                self._in_str = True
+            elif c in "{[":
+                stack.append(self._CLOSERS[c])
+                self._mark(offset + i + 1)
+            elif c in "}]":
+                stack.pop()
+                self._mark(offset + i + 1)
+                if not stack:
+                    if self.snapshot() is None:
+                        # Never resume inside a closed object, where a nested
+                        # one could be mistaken for the document
+                        return offset + i + 1
+                    self.complete = True
+                    return None
+            elif c == ",":
+                self._mark(offset + i)
+        return None
+
+    def _mark(self, pos: int) -> None:
+        self._cut = pos
+        self._cut_closers = "".join(reversed(self._stack))
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    def snapshot(self) -> Any:
+        """
+        The object so far, with any unfinished member dropped. None before '{'
+        arrives, or if what has arrived doesn't decode.
+        """
+        if not self._started:
+            return None
+        s = _normalize_quotes(self.text[self._start:self._cut] + self._cut_closers)
+        try:
+            return loads(s)
+        except ValueError:
+            return None
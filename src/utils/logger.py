@@ -1,27 +1,100 @@
-
+import atexit
+import queue
 import sys
-from datetime import datetime
+import threading
+import time
+
+
+def _format(message: str, args: tuple) -> str:
+    # %-style arguments are only interpolated once the message is emitted
+    return message % args if args else message
 
 
 class Logger:
 
     def __init__(self):
         self.verbose = True
+        # info/debug lines are written by a background thread, so callers never
+        # block on the console; one queue keeps them in call order
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        # debug() timestamps only change once a second, so reuse the last one
+        self._ts_sec = 0
+        self._ts_str = ""
+        atexit.register(self.flush)
+
+    def _emit(self, stream, line: str) -> None:
+        writer = self._writer
+        if writer is None or not writer.is_alive():  # not started yet, or lost in a fork
+            with self._writer_lock:
+                if self._writer is None or not self._writer.is_alive():
+                    self._writer = threading.Thread(target=self._drain, name="logger", daemon=True)
+                    self._writer.start()
+        self._queue.put((stream, line))
+
+    def _emit_now(self, stream, line: str) -> None:
+        # Errors and warnings go out before the call returns, after anything
+        # queued ahead of them, so they stay ordered with print() and survive
+        # a crash or os._exit right after
+        self.flush()
+        self._write(stream, [line])
+
+    def _drain(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            # Take whatever else piled up meanwhile, so a burst is one write per stream run
+            while len(batch) < 64:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stream, lines = None, []
+            for target, line in batch:
+                if target is not stream:
+                    self._write(stream, lines)
+                    stream, lines = target, []
+                if isinstance(line, threading.Event):  # queued by flush()
+                    line.set()
+                else:
+                    lines.append(line)
+            self._write(stream, lines)
+
+    @staticmethod
+    def _write(stream, lines) -> None:
+        if lines:
+            try:
+                stream.write("\n".join(lines) + "\n")
+                stream.flush()
+            except Exception:
+                pass  # e.g. the stream was closed; never kill the writer
+
+    def flush(self) -> None:
+        """Block until every message logged so far has been written."""
+        writer = self._writer
+        if writer is None or not writer.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put((None, done))
+        done.wait()
 
-    def info(self, message: str):
+    def info(self, message: str, *args):
         if self.verbose:
-            print(message)
+            self._emit(sys.stdout, _format(message, args))
 
-    def error(self, message: str):
-        print(f"ERROR: {message}", file=sys.stderr)
+    def error(self, message: str, *args):
+        self._emit_now(sys.stderr, f"ERROR: {_format(message, args)}")
 
-    def warning(self, message: str):
-        print(f"WARNING: {message}", file=sys.stderr)
+    def warning(self, message: str, *args):
+        self._emit_now(sys.stderr, f"WARNING: {_format(message, args)}")
 
-    def debug(self, message: str):
+    def debug(self, message: str, *args):
         if self.verbose:
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            print(f"[{timestamp}] DEBUG: {message}")
+            now = int(time.time())
+            if now != self._ts_sec:
+                self._ts_str = time.strftime("%H:%M:%S", time.localtime(now))
+                self._ts_sec = now
+            self._emit(sys.stdout, f"[{self._ts_str}] DEBUG: {_format(message, args)}")
 
 
 logger = Logger()
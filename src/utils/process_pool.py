@@ -0,0 +1,17 @@
+"""Shared worker process pool for CPU-bound tool work."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+# Created on first use, so importing the tools never forks worker processes
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    # One pool per process, shared by every tool, so there is only ever one
+    # cpu_count()-sized set of workers
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _process_pool
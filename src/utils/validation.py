@@ -0,0 +1,15 @@
+"""Input validation helpers."""
+
+import re
+
+_TICKER_RE = re.compile(r"^[A-Z0-9]{1,5}$")
+
+
+def validate_ticker(ticker: str) -> str:
+    # Normalize to upper case and reject anything that isn't 1-5 ASCII alphanumerics
+    symbol = ticker.strip().upper()
+    if not _TICKER_RE.match(symbol):
+        raise ValueError(
+            f"Invalid ticker symbol {ticker!r}. Please use 1-5 alphanumeric characters."
+        )
+    return symbol